@@ -2,9 +2,24 @@
 Geographic utilities for distance calculation and filtering.
 """
 import math
-from typing import List, Tuple
+import numpy as np
+from typing import List, Tuple, Optional
 from domain.models import Location
 
+# Optional: numexpr evaluates the vectorized haversine on a thread pool
+try:
+    import numexpr as ne
+    NUMEXPR_AVAILABLE = True
+except ImportError:
+    NUMEXPR_AVAILABLE = False
+
+EARTH_RADIUS_KM = 6371.0
+
+_HAVERSINE_EXPR = (
+    "2 * R * arcsin(sqrt(sin((lat2 - lat1) / 2) ** 2 + "
+    "cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2))"
+)
+
 
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
@@ -30,13 +45,55 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     return R * c
 
 
+def location_coords(locations: List[Location]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build latitude/longitude arrays (in radians) for a list of locations.
+    
+    Args:
+        locations: List of locations
+    
+    Returns:
+        (lats_rad, lons_rad) float64 arrays aligned with `locations`
+    """
+    lats = np.radians(np.fromiter((loc.lat for loc in locations), dtype=np.float64, count=len(locations)))
+    lons = np.radians(np.fromiter((loc.lon for loc in locations), dtype=np.float64, count=len(locations)))
+    return lats, lons
+
+
+def haversine_distances(lat: float, lon: float, lats_rad: np.ndarray, lons_rad: np.ndarray) -> np.ndarray:
+    """
+    Vectorized Haversine distance from one point to many.
+    
+    Args:
+        lat, lon: Reference point in degrees
+        lats_rad, lons_rad: Target points in radians (see `location_coords`)
+    
+    Returns:
+        numpy array of distances in kilometers
+    """
+    lat1 = math.radians(lat)
+    lon1 = math.radians(lon)
+    
+    if NUMEXPR_AVAILABLE:
+        return ne.evaluate(_HAVERSINE_EXPR, local_dict={
+            "R": EARTH_RADIUS_KM,
+            "lat1": lat1, "lon1": lon1,
+            "lat2": lats_rad, "lon2": lons_rad,
+        })
+    
+    a = (np.sin((lats_rad - lat1) / 2) ** 2 +
+         math.cos(lat1) * np.cos(lats_rad) * np.sin((lons_rad - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
 def filter_locations(
     locations: List[Location],
     user_lat: float,
     user_lon: float,
     radius_km: float,
     types_selected: List[str],
-    max_results: int = None
+    max_results: int = None,
+    coords: Optional[Tuple[np.ndarray, np.ndarray]] = None
 ) -> List[Location]:
     """
     Filter locations by radius and accepted types, return nearest locations.
@@ -47,21 +104,28 @@ def filter_locations(
         radius_km: Search radius in kilometers (use None or very large value for no radius limit)
         types_selected: List of plastic types to filter by
         max_results: Maximum number of results to return (None for all)
+        coords: Precomputed (lats_rad, lons_rad) from `location_coords` (built here if None)
     
     Returns:
         Filtered and sorted list of locations (by distance), limited to max_results
     """
+    if not locations:
+        return []
+    
+    # Distances to every location in one vectorized pass
+    if coords is None:
+        coords = location_coords(locations)
+    distances = haversine_distances(user_lat, user_lon, coords[0], coords[1]).tolist()
+    
     filtered = []
     
-    for loc in locations:
+    for loc, distance in zip(locations, distances):
         # Check if location accepts any of the selected types
         if types_selected:
             accepts = any(loc.accepts_type(t) for t in types_selected)
             if not accepts:
                 continue
         
-        # Calculate distance
-        distance = haversine_distance(user_lat, user_lon, loc.lat, loc.lon)
         loc.distance_km = distance
         
         # Filter by radius (if radius_km is None or very large, don't filter)
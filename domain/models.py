@@ -2,7 +2,7 @@
 Domain models for detections and locations.
 """
 from dataclasses import dataclass
-from typing import Optional, List, Dict, Tuple
+from typing import Optional, List, Dict, Sequence, Tuple
 
 
 @dataclass
@@ -10,7 +10,7 @@ class Detection:
     """Detection result from ML model."""
     label: str
     confidence: float
-    probs: List[float]
+    probs: Sequence[float]  # float32 ndarray from the workers
     raw_label: str
     raw_conf: float
     bbox: Optional[Tuple[int, int, int, int]] = None  # (x1, y1, x2, y2)
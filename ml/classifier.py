@@ -4,18 +4,43 @@ import torch
 import torch.nn as nn
 from torchvision import models
 
-from ml.config import CLASSES
-from ml.preprocess import preprocess_bgr
+from ml.config import CLASSES, IMG_SIZE, MEAN, STD
+from ml.preprocess import preprocess_bgr, preprocess_bgr_preresized
 
 class PlastiTraceClassifier:
-    def __init__(self, model_path: str):
+    input_size = IMG_SIZE  # Square model input side, in pixels
+
+    def __init__(self, model_path: str, precision: str = "fp32"):
+        """
+        Args:
+            model_path: Path to the .pth checkpoint
+            precision: "fp32" or "fp16" (CUDA only; falls back to fp32 on CPU)
+        """
         if not os.path.exists(model_path):
             raise FileNotFoundError(f"Model file not found: {model_path}")
 
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        # Batching only pays off where per-call launch overhead dominates (GPU)
+        self.supports_batch = self.device.type == "cuda"
+        self.precision = self._resolve_precision(precision)
+        self._dtype = torch.float16 if self.precision == "fp16" else torch.float32
         self.model = self._load_model(model_path)
         self.model.eval()
 
+        # fp16: upload uint8 pixels and normalize on the device (1/4 of the fp32 upload)
+        self._normalize_on_device = self.precision == "fp16"
+        if self._normalize_on_device:
+            self._mean = torch.tensor(MEAN, device=self.device, dtype=self._dtype).view(1, 3, 1, 1) * 255
+            self._std = torch.tensor(STD, device=self.device, dtype=self._dtype).view(1, 3, 1, 1) * 255
+
+    def _resolve_precision(self, precision: str) -> str:
+        if precision not in ("fp32", "fp16"):
+            raise ValueError(f"Unknown precision: {precision}")
+        if precision == "fp16" and self.device.type != "cuda":
+            print("Warning: fp16 needs CUDA, using fp32")
+            return "fp32"
+        return precision
+
     def _extract_state_dict(self, ckpt):
         if isinstance(ckpt, dict):
             if "model_state_dict" in ckpt:
@@ -41,23 +66,105 @@ class PlastiTraceClassifier:
         sd = self._extract_state_dict(ckpt)
         model.load_state_dict(sd, strict=True)
 
-        # force FP32
-        model = model.float().to(self.device)
+        model = model.to(self.device, dtype=self._dtype)
         return model
 
+    def _device_tensor(self, frames_bgr) -> torch.Tensor:
+        """
+        (N,H,W,3) uint8 BGR frames -> normalized (N,3,H,W) RGB tensor, converted on the device.
+        """
+        x = torch.from_numpy(frames_bgr).to(self.device, non_blocking=True)
+        x = x.flip(-1).permute(0, 3, 1, 2).to(self._dtype)
+        return x.sub_(self._mean).div_(self._std)
+
     @torch.no_grad()
-    def predict(self, tensor: torch.Tensor) -> dict:
-        x = tensor.to(self.device, dtype=torch.float32, non_blocking=True)
+    def _forward_batch_probs(self, tensor: torch.Tensor) -> torch.Tensor:
+        x = tensor.to(self.device, dtype=self._dtype, non_blocking=True)
         logits = self.model(x)
-        probs = torch.softmax(logits, dim=1)[0]
+        return torch.softmax(logits.float(), dim=1)
+
+    def _forward_probs(self, tensor: torch.Tensor) -> torch.Tensor:
+        return self._forward_batch_probs(tensor)[0]
+
+    @torch.no_grad()
+    def predict(self, tensor: torch.Tensor, probs_out=None) -> dict:
+        """
+        Args:
+            tensor: (1,3,H,W) preprocessed input
+            probs_out: Optional float32 array of len(CLASSES); if given, probs are
+                written into it and returned as that array instead of a new list
+        """
+        probs = self._forward_probs(tensor)
 
         idx = int(torch.argmax(probs).item())
         label = CLASSES[idx]
         conf = float(probs[idx].item())
-        probs_np = probs.detach().cpu().numpy().astype(np.float32)
+        probs_np = probs.detach().cpu().numpy()
 
-        return {"label": label, "confidence": conf, "probs": probs_np.tolist()}
+        if probs_out is not None:
+            np.copyto(probs_out, probs_np)
+            return {"label": label, "confidence": conf, "probs": probs_out}
+        return {"label": label, "confidence": conf, "probs": probs_np.astype(np.float32).tolist()}
 
     def predict_from_bgr(self, frame_bgr) -> dict:
         t = preprocess_bgr(frame_bgr)
         return self.predict(t)
+
+    def predict_from_bgr_preresized(self, frame_bgr, probs_out=None) -> dict:
+        """Predict from a BGR image already resized to (input_size, input_size)."""
+        t = preprocess_bgr_preresized(frame_bgr)
+        return self.predict(t, probs_out)
+
+    @torch.no_grad()
+    def predict_from_bgr_batch(self, rois, probs_out=None) -> list:
+        """
+        Classify several BGR images in one forward pass.
+
+        Args:
+            rois: List of BGR images (resized to input_size if needed)
+            probs_out: Optional float32 array of shape (len(rois), len(CLASSES)); if
+                given, probs are written into its rows and returned as those rows
+
+        Returns:
+            List of {label, confidence, probs} dicts, in the order of rois
+        """
+        preresized = all(roi.shape[:2] == (IMG_SIZE, IMG_SIZE) for roi in rois)
+        if self._normalize_on_device and preresized:
+            batch = self._device_tensor(np.stack(rois))
+        else:
+            batch = torch.cat([
+                preprocess_bgr_preresized(roi) if roi.shape[:2] == (IMG_SIZE, IMG_SIZE)
+                else preprocess_bgr(roi)
+                for roi in rois
+            ])
+        probs_np = self._forward_batch_probs(batch).cpu().numpy()
+        if probs_out is not None:
+            np.copyto(probs_out, probs_np)
+            probs_np = probs_out
+
+        results = []
+        for row in probs_np:
+            idx = int(row.argmax())
+            probs = row if probs_out is not None else row.astype(np.float32).tolist()
+            results.append({"label": CLASSES[idx], "confidence": float(row[idx]), "probs": probs})
+        return results
+
+    @torch.no_grad()
+    def predict_into(self, frame_bgr, probs_out) -> tuple:
+        """
+        Minimal-overhead prediction for a preresized BGR image.
+
+        Args:
+            frame_bgr: BGR image already resized to (input_size, input_size)
+            probs_out: float32 array of len(CLASSES), overwritten with probabilities
+
+        Returns:
+            (idx, confidence) of the top class
+        """
+        if self._normalize_on_device:
+            t = self._device_tensor(np.ascontiguousarray(frame_bgr)[None])
+        else:
+            t = preprocess_bgr_preresized(frame_bgr)
+        np.copyto(probs_out, self._forward_probs(t).cpu().numpy())
+        idx = int(probs_out.argmax())
+        return idx, float(probs_out[idx])
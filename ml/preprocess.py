@@ -9,7 +9,19 @@ def preprocess_bgr(frame_bgr):
     """
     rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
     rgb = cv2.resize(rgb, (IMG_SIZE, IMG_SIZE), interpolation=cv2.INTER_AREA)
+    return _normalize_rgb(rgb)
 
+def preprocess_bgr_preresized(frame_bgr):
+    """
+    Like preprocess_bgr for a frame already resized to (IMG_SIZE, IMG_SIZE).
+    """
+    rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
+    return _normalize_rgb(rgb)
+
+def _normalize_rgb(rgb):
+    """
+    (IMG_SIZE, IMG_SIZE, 3) uint8 RGB -> normalized (1,3,H,W) float tensor.
+    """
     x = rgb.astype("float32") / 255.0
     x = (x - np.array(MEAN, dtype=np.float32)) / np.array(STD, dtype=np.float32)
     x = np.transpose(x, (2, 0, 1))  # CHW
@@ -0,0 +1,76 @@
+"""
+Fused per-inference stability step: EMA smoothing, argmax, hysteresis and
+confidence gating in one pass over the probability vector.
+Compiled with numba when available, plain Python otherwise.
+"""
+
+# Optional: numba compiles the kernel to a single native call
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit."""
+        return lambda func: func
+
+
+@njit(cache=True, fastmath=True)
+def stability_step(probs_new, probs_state, alpha, has_state,
+                   cur_idx, cur_conf, min_conf, switch_margin, threshold):
+    """
+    Args:
+        probs_new: float32 probabilities from the classifier
+        probs_state: float32 EMA state, updated in place (renormalized)
+        alpha: EMA smoothing factor
+        has_state: False on the first update (state is initialized from probs_new)
+        cur_idx: Current hysteresis class index, -1 if none
+        cur_conf: Current hysteresis confidence
+        min_conf: Minimum confidence to accept a first label
+        switch_margin: Margin required to switch labels
+        threshold: Confidence gating threshold
+    
+    Returns:
+        (cur_idx, cur_conf, passes_gate) after this update
+    """
+    n = probs_new.shape[0]
+    
+    # EMA + renormalize
+    total = 0.0
+    for i in range(n):
+        if has_state:
+            v = alpha * probs_new[i] + (1.0 - alpha) * probs_state[i]
+        else:
+            v = probs_new[i]
+        probs_state[i] = v
+        total += v
+    if total > 0:
+        inv = 1.0 / total
+        for i in range(n):
+            probs_state[i] *= inv
+    else:
+        for i in range(n):
+            probs_state[i] = 1.0 / n
+    
+    # Argmax
+    idx = 0
+    conf = float(probs_state[0])
+    for i in range(1, n):
+        if probs_state[i] > conf:
+            idx = i
+            conf = float(probs_state[i])
+    
+    # Hysteresis
+    if cur_idx < 0:
+        if conf >= min_conf:
+            cur_idx = idx
+            cur_conf = conf
+    elif idx == cur_idx:
+        cur_conf = conf
+    elif conf >= cur_conf + switch_margin:
+        cur_idx = idx
+        cur_conf = conf
+    
+    # Gating
+    return cur_idx, cur_conf, cur_conf >= threshold
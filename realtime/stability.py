@@ -3,6 +3,9 @@ Stability module for realtime prediction smoothing and hysteresis.
 """
 import numpy as np
 from ml.config import CLASSES
+from realtime._stability_kernel import stability_step
+
+_CLASS_INDEX = {label: i for i, label in enumerate(CLASSES)}
 
 
 class ProbSmoother:
@@ -14,7 +17,8 @@ class ProbSmoother:
             alpha: EMA smoothing factor (0-1). Higher = more responsive, lower = smoother.
         """
         self.alpha = float(alpha)
-        self._probs = None
+        self._probs = None  # float32 EMA state, updated in place
+        self._probs_scratch = np.empty(len(CLASSES), dtype=np.float32)
     
     def update(self, probs):
         """
@@ -24,7 +28,8 @@ class ProbSmoother:
             probs: numpy array of shape (4,) with probabilities for [HDPE, PET, PP, PS]
         
         Returns:
-            numpy array of smoothed and renormalized probabilities
+            numpy array of smoothed and renormalized probabilities. This is the
+            smoother's state buffer: treat it as read-only, it changes on the next update.
         """
         probs = np.asarray(probs, dtype=np.float32)
         if len(probs) != len(CLASSES):
@@ -33,16 +38,31 @@ class ProbSmoother:
         if self._probs is None:
             self._probs = probs.copy()
         else:
-            self._probs = self.alpha * probs + (1.0 - self.alpha) * self._probs
+            np.multiply(probs, self.alpha, out=self._probs_scratch)
+            self._probs *= 1.0 - self.alpha
+            self._probs += self._probs_scratch
         
         # Renormalize to ensure sum = 1.0
-        total = np.sum(self._probs)
+        total = self._probs.sum()
         if total > 0:
-            self._probs = self._probs / total
+            self._probs /= total
         else:
-            self._probs = np.ones(len(CLASSES), dtype=np.float32) / len(CLASSES)
+            self._probs.fill(1.0 / len(CLASSES))
+        
+        return self._probs
+    
+    def state_for_update(self):
+        """
+        Hand the EMA state to an external in-place update (see stabilize).
         
-        return self._probs.copy()
+        Returns:
+            (state, has_state): the persistent float32 state buffer, and whether it
+            already holds state. If has_state is False the caller must fill it.
+        """
+        has_state = self._probs is not None
+        if not has_state:
+            self._probs = np.empty(len(CLASSES), dtype=np.float32)
+        return self._probs, has_state
     
     def reset(self):
         """Reset internal state."""
@@ -61,6 +81,7 @@ class HysteresisLabel:
         self.min_conf = float(min_conf)
         self.switch_margin = float(switch_margin)
         self._current_label = None
+        self._current_idx = -1  # Index of _current_label in CLASSES, -1 if none/unknown
         self._current_conf = 0.0
     
     def update(self, label, confidence):
@@ -78,6 +99,7 @@ class HysteresisLabel:
             # First update: accept if above min_conf
             if confidence >= self.min_conf:
                 self._current_label = label
+                self._current_idx = _CLASS_INDEX.get(label, -1)
                 self._current_conf = confidence
         else:
             # Subsequent updates: check if we should switch
@@ -88,14 +110,34 @@ class HysteresisLabel:
                 # Different label: only switch if new confidence is significantly higher
                 if confidence >= self._current_conf + self.switch_margin:
                     self._current_label = label
+                    self._current_idx = _CLASS_INDEX.get(label, -1)
                     self._current_conf = confidence
                 # Otherwise keep current label (hysteresis)
         
         return (self._current_label, self._current_conf)
     
+    @property
+    def state(self):
+        """(class index in CLASSES or -1, confidence) of the current label."""
+        return self._current_idx, self._current_conf
+    
+    @state.setter
+    def state(self, value):
+        idx, conf = value
+        if idx != self._current_idx:
+            self._current_idx = idx
+            self._current_label = CLASSES[idx] if idx >= 0 else None
+        self._current_conf = conf
+    
+    @property
+    def label(self):
+        """Current label, or None before the first accepted update."""
+        return self._current_label
+    
     def reset(self):
         """Reset internal state."""
         self._current_label = None
+        self._current_idx = -1
         self._current_conf = 0.0
 
 
@@ -121,3 +163,38 @@ def apply_confidence_gating(label, conf, threshold):
     
     return (gated_label, raw_label, raw_conf)
 
+
+def stabilize(probs, smoother, hysteresis, threshold):
+    """
+    Smoothing, argmax, hysteresis and gating in one fused kernel call.
+    Equivalent to smoother.update -> argmax -> hysteresis.update ->
+    apply_confidence_gating; smoother and hysteresis state are updated.
+    
+    Args:
+        probs: Classifier probabilities for CLASSES
+        smoother: ProbSmoother holding the EMA state
+        hysteresis: HysteresisLabel holding the current label
+        threshold: Confidence threshold for gating
+    
+    Returns:
+        (smoothed_probs, gated_label, raw_label, raw_conf) tuple; smoothed_probs
+        is the smoother's state buffer and must be treated as read-only
+    """
+    probs = np.asarray(probs, dtype=np.float32)
+    if len(probs) != len(CLASSES):
+        raise ValueError(f"Expected {len(CLASSES)} probabilities, got {len(probs)}")
+    
+    state, has_state = smoother.state_for_update()
+    
+    # Scalar state in, scalar state out; the index maps to a label string only in the setter
+    cur_idx, cur_conf = hysteresis.state
+    cur_idx, cur_conf, passes = stability_step(
+        probs, state, smoother.alpha, has_state,
+        cur_idx, float(cur_conf),
+        hysteresis.min_conf, hysteresis.switch_margin, float(threshold)
+    )
+    hysteresis.state = (cur_idx, cur_conf)
+    label = hysteresis.label
+    
+    gated_label = label if passes else "Unknown"
+    return state, gated_label, label, cur_conf
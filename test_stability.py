@@ -0,0 +1,122 @@
+"""Unit tests for the realtime stability layer."""
+
+import numpy as np
+from realtime.stability import ProbSmoother, HysteresisLabel, apply_confidence_gating, stabilize
+from ml.config import CLASSES
+
+
+# Probability sequence exercising: first label rejected (below min_conf), first label
+# accepted, same label, different argmax without enough margin (no switch), switch,
+# and gating below threshold
+PROBS_SEQUENCE = [
+    [0.40, 0.30, 0.20, 0.10],
+    [0.90, 0.05, 0.03, 0.02],
+    [0.60, 0.30, 0.05, 0.05],
+    [0.10, 0.80, 0.05, 0.05],
+    [0.02, 0.96, 0.01, 0.01],
+    [0.02, 0.96, 0.01, 0.01],
+    [0.01, 0.97, 0.01, 0.01],
+    [0.30, 0.20, 0.30, 0.20],
+]
+
+# Held (hysteresis) label after each step of PROBS_SEQUENCE
+EXPECTED_LABELS = [None, "HDPE", "HDPE", "HDPE", "PET", "PET", "PET", "PET"]
+
+ALPHA = 0.5
+MIN_CONF = 0.55
+SWITCH_MARGIN = 0.10
+THRESHOLD = 0.65
+
+
+def _reference_step(probs, smoother, hysteresis, threshold):
+    """Unfused pipeline: smoother.update -> argmax -> hysteresis.update -> gating."""
+    smoothed = smoother.update(probs).copy()
+    idx = int(np.argmax(smoothed))
+    label, conf = hysteresis.update(CLASSES[idx], float(smoothed[idx]))
+    gated_label, raw_label, raw_conf = apply_confidence_gating(label, conf, threshold)
+    return smoothed, gated_label, raw_label, raw_conf
+
+
+def _new_state():
+    return (ProbSmoother(alpha=ALPHA),
+            HysteresisLabel(min_conf=MIN_CONF, switch_margin=SWITCH_MARGIN))
+
+
+def test_stabilize_matches_reference():
+    """Test fused stabilize() against the step-by-step pipeline."""
+    ref_smoother, ref_hysteresis = _new_state()
+    smoother, hysteresis = _new_state()
+
+    for step, p in enumerate(PROBS_SEQUENCE):
+        probs = np.array(p, dtype=np.float32)
+        ref = _reference_step(probs, ref_smoother, ref_hysteresis, THRESHOLD)
+        smoothed, gated_label, raw_label, raw_conf = stabilize(
+            probs, smoother, hysteresis, THRESHOLD
+        )
+
+        assert np.allclose(smoothed, ref[0], atol=1e-6), f"Step {step}: smoothed probs differ"
+        assert gated_label == ref[1], f"Step {step}: gated label {gated_label} != {ref[1]}"
+        assert raw_label == ref[2], f"Step {step}: raw label {raw_label} != {ref[2]}"
+        assert abs(raw_conf - ref[3]) < 1e-6, f"Step {step}: raw conf {raw_conf} != {ref[3]}"
+
+    print("✓ Stabilize equivalence test passed")
+
+
+def test_stabilize_hysteresis_cases():
+    """Test that the sequence covers first-label, no-switch and switch cases."""
+    smoother, hysteresis = _new_state()
+
+    labels = []
+    for p in PROBS_SEQUENCE:
+        _, _, raw_label, _ = stabilize(np.array(p, dtype=np.float32), smoother, hysteresis, THRESHOLD)
+        labels.append(raw_label)
+
+    assert labels == EXPECTED_LABELS, f"Unexpected label sequence: {labels}"
+    print("✓ Stabilize hysteresis cases test passed")
+
+
+def test_stabilize_after_reset():
+    """Test that stabilize() restarts like the reference pipeline after reset()."""
+    ref_smoother, ref_hysteresis = _new_state()
+    smoother, hysteresis = _new_state()
+
+    for p in PROBS_SEQUENCE[:3]:
+        probs = np.array(p, dtype=np.float32)
+        _reference_step(probs, ref_smoother, ref_hysteresis, THRESHOLD)
+        stabilize(probs, smoother, hysteresis, THRESHOLD)
+
+    for obj in (ref_smoother, ref_hysteresis, smoother, hysteresis):
+        obj.reset()
+
+    probs = np.array(PROBS_SEQUENCE[4], dtype=np.float32)
+    ref = _reference_step(probs, ref_smoother, ref_hysteresis, THRESHOLD)
+    result = stabilize(probs, smoother, hysteresis, THRESHOLD)
+
+    assert np.allclose(result[0], ref[0], atol=1e-6)
+    assert result[1:3] == ref[1:3]
+    print("✓ Stabilize reset test passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("Running stability layer tests...\n")
+
+    try:
+        test_stabilize_matches_reference()
+        test_stabilize_hysteresis_cases()
+        test_stabilize_after_reset()
+
+        print("\n✅ All tests passed!")
+        return True
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return False
+    except Exception as e:
+        print(f"\n❌ Test error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == "__main__":
+    run_all_tests()
@@ -363,12 +363,17 @@ class MainWindow(QMainWindow):
         self.camera_worker = CameraWorker(camera_index)
         
         # Connect frame updates (FPS is updated separately)
-        def on_frame_ready(frame):
-            self.video_widget.setFrame(frame, self.video_widget.latest_fps)
+        camera_worker = self.camera_worker
+        
+        def on_frame_ready(seq):
+            frame = camera_worker.frame_at(seq)
+            if frame is None:
+                return  # A newer frame is already published
+            self.video_widget.setFrame(frame, self.video_widget.latest_fps,
+                                       lambda: camera_worker.is_intact(seq))
         
         def on_fps_ready(fps):
-            if self.video_widget.latest_frame is not None:
-                self.video_widget.setFrame(self.video_widget.latest_frame, fps)
+            self.video_widget.setFps(fps)
         
         self.camera_worker.frameReady.connect(on_frame_ready)
         self.camera_worker.fpsReady.connect(on_fps_ready)
@@ -387,7 +392,7 @@ class MainWindow(QMainWindow):
         )
         
         # Create inference worker
-        self.inference_worker = InferenceWorker(self.classifier)
+        self.inference_worker = InferenceWorker(self.classifier, self.camera_worker)
         self.inference_worker.resultReady.connect(self.on_inference_result)
         
         # Update inference worker settings
@@ -414,18 +419,17 @@ class MainWindow(QMainWindow):
             lambda v: self.inference_worker.set_hysteresis_margin(v / 100.0)
         )
         
-        # Store latest frame and bbox for inference
+        # Store latest frame (sequence number) and bbox for inference
         self._latest_frame_for_inference = None
         self._latest_bbox_for_inference = None
         
         # Connect camera frames to inference worker
-        def on_frame_ready(frame):
-            self._latest_frame_for_inference = frame
-            if self._latest_frame_for_inference is not None:
-                self.inference_worker.inferenceRequested.emit(
-                    self._latest_frame_for_inference,
-                    self._latest_bbox_for_inference
-                )
+        def on_frame_ready(seq):
+            self._latest_frame_for_inference = seq
+            self.inference_worker.inferenceRequested.emit(
+                self._latest_frame_for_inference,
+                self._latest_bbox_for_inference
+            )
         
         def on_bbox_ready(bbox, tracker_active):
             self._latest_bbox_for_inference = bbox
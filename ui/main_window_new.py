@@ -378,6 +378,7 @@ class MainWindow(QMainWindow):
             self.inference_thread = None
         
         if self.inference_worker:
+            self.inference_worker.shutdown()
             self.inference_worker = None
         
         self.running = False
@@ -403,18 +404,25 @@ class MainWindow(QMainWindow):
         self.conf_text.setText("Confidence: 0%")
         self.conf_bar.setValue(0)
     
-    def on_frame_received(self, frame):
+    def on_frame_received(self, seq):
         """Handle frame from capture worker."""
+        if self.capture_worker is None:
+            return
+        capture_worker = self.capture_worker
+        frame = capture_worker.frame_at(seq)
+        if frame is None:
+            return  # A newer frame is already published
+        is_intact = lambda: capture_worker.is_intact(seq)
+        
         fps = self.video_widget.latest_fps
-        self.video_widget.setFrame(frame, fps)
+        self.video_widget.setFrame(frame, fps, is_intact)  # Torn display copies are dropped
         # Send to inference worker
         if self.inference_worker:
-            self.inference_worker.on_frame_received(frame)
+            self.inference_worker.on_frame_received(frame, is_intact)
     
     def on_fps_received(self, fps):
         """Handle FPS update."""
-        if self.video_widget.latest_frame is not None:
-            self.video_widget.setFrame(self.video_widget.latest_frame, fps)
+        self.video_widget.setFps(fps)
     
     def on_bbox_received(self, bbox, tracker_active):
         """Handle bbox update."""
@@ -2,6 +2,8 @@
 MapView: QWebEngine + Leaflet mapping widget with QWebChannel bridge.
 """
 import os
+import time
+import numpy as np
 from pathlib import Path
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QSlider, QPushButton, QFrame, QScrollArea
 from PyQt5.QtWebEngineWidgets import QWebEngineView
@@ -18,7 +20,7 @@ except ImportError:
     LOCATION_AVAILABLE = False
     print("Warning: QtLocation not available. GPS features will be disabled.")
 from domain.models import Location
-from domain.geo import filter_locations, haversine_distance
+from domain.geo import filter_locations, haversine_distance, location_coords
 from ml.config import CLASSES
 
 
@@ -188,6 +190,10 @@ class MapView(QWidget):
         self.user_lat = -6.2297  # Jakarta Selatan
         self.user_lon = 106.7997
         self.locations: list[Location] = []
+        self._location_coords = None  # (lats_rad, lons_rad) aligned with self.locations
+        self._search_keys = np.empty(0, dtype=str)  # lowercased "name address" per location
+        self._search_text = ""
+        self._last_search_fire = 0.0
         self.filtered_locations: list[Location] = []
         self.selected_types: set[str] = set()
         self.auto_follow = False  # Auto-follow user location
@@ -197,7 +203,7 @@ class MapView(QWidget):
         self.map_bridge.markerClicked.connect(self.on_marker_clicked)
         self.map_bridge.userLocationFromBrowser.connect(self.set_user_location_from_browser)
         
-        # Debounce timer
+        # Trailing debounce timer (leading edge fires from _on_search_changed)
         self.search_timer = QTimer()
         self.search_timer.setSingleShot(True)
         self.search_timer.timeout.connect(self._apply_search)
@@ -400,6 +406,10 @@ class MapView(QWidget):
     def set_locations(self, locations: list[Location]):
         """Set locations to display."""
         self.locations = locations
+        self._location_coords = location_coords(locations)
+        self._search_keys = np.array(
+            [f"{loc.name} {loc.address}".lower() for loc in locations], dtype=str
+        )
         print(f"MapView: Set {len(locations)} locations")
         self._update_map()
     
@@ -423,15 +433,24 @@ class MapView(QWidget):
         types_list = list(self.selected_types) if self.selected_types else []
         radius = self.radius_slider.value()
         
+        # Apply search text (vectorized substring match over name + address)
+        locations = self.locations
+        coords = self._location_coords
+        if self._search_text and locations:
+            idx = np.flatnonzero(np.char.find(self._search_keys, self._search_text) >= 0)
+            locations = [self.locations[i] for i in idx]
+            coords = (coords[0][idx], coords[1][idx])
+        
         # Show ALL locations within radius (no limit)
         # With radius set to 4000km (covers all Indonesia), this will show all locations from anywhere in Indonesia
         self.filtered_locations = filter_locations(
-            self.locations,
+            locations,
             self.user_lat,
             self.user_lon,
             radius_km=radius,  # Use the radius value (default 4000km covers all Indonesia)
             types_selected=types_list,
-            max_results=None  # Show all locations, no limit
+            max_results=None,  # Show all locations, no limit
+            coords=coords
         )
         
         if self.filtered_locations:
@@ -537,14 +556,21 @@ class MapView(QWidget):
         self.list_layout.addStretch()
     
     def _on_search_changed(self, text: str):
-        """Handle search text change (debounced)."""
-        self.search_timer.stop()
+        """Handle search text change (throttled leading edge + trailing debounce)."""
+        # Fire immediately at most every 100ms while typing
+        if time.monotonic() - self._last_search_fire >= 0.1:
+            self._apply_search()
+        # Always schedule a trailing call so the final text is applied
         self.search_timer.start(300)  # 300ms debounce
     
     def _apply_search(self):
         """Apply search filter."""
-        # TODO: Implement search filtering
-        pass
+        self._last_search_fire = time.monotonic()
+        text = self.search_input.text().strip().lower()
+        if text == self._search_text:
+            return
+        self._search_text = text
+        self._update_map()
     
     def _on_radius_changed(self, value: int):
         """Handle radius slider change."""
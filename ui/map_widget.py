@@ -4,10 +4,11 @@ Map widget for displaying nearby waste disposal/recycling locations.
 import math
 import random
 import os
+import numpy as np
 import pandas as pd
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QListWidget, QListWidgetItem
-from PyQt5.QtGui import QPainter, QColor, QFont, QPen, QBrush
-from PyQt5.QtCore import Qt, QRect, QPoint
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QListView, QStyledItemDelegate, QStyle
+from PyQt5.QtGui import QPainter, QColor, QFont, QFontMetrics, QPen, QBrush
+from PyQt5.QtCore import Qt, QRect, QPoint, QSize, QAbstractListModel, QModelIndex
 from ml.config import CLASSES
 
 # Default location (user's location - could be from GPS)
@@ -97,6 +98,12 @@ class MapWidget(QWidget):
         self.locations = []  # List of (name, lat, lon, distance_km)
         self.user_lat = DEFAULT_LAT
         self.user_lon = DEFAULT_LON
+        
+        # Cached marker coordinates and padded map bounds
+        # (recomputed only when locations or user position change)
+        self._lats = np.empty(0, dtype=np.float64)
+        self._lons = np.empty(0, dtype=np.float64)
+        self._bounds = None  # (min_lat, max_lat, min_lon, max_lon)
         self.setMinimumSize(400, 300)
         self.setStyleSheet("background-color: #1e293b; border-radius: 10px;")
     
@@ -108,14 +115,44 @@ class MapWidget(QWidget):
             locations: List of (name, address, lat, lon, distance_km) tuples
         """
         self.locations = locations
+        self._lats = np.array([loc[2] for loc in locations], dtype=np.float64)
+        self._lons = np.array([loc[3] for loc in locations], dtype=np.float64)
+        self._update_bounds()
         self.update()  # Trigger repaint
     
     def set_user_location(self, lat, lon):
         """Set user's current location."""
         self.user_lat = lat
         self.user_lon = lon
+        self._update_bounds()
         self.update()
     
+    def _update_bounds(self):
+        """Recompute padded lat/lon bounds covering all markers and the user."""
+        if not self.locations:
+            self._bounds = None
+            return
+        
+        min_lat = min(self._lats.min(), self.user_lat)
+        max_lat = max(self._lats.max(), self.user_lat)
+        min_lon = min(self._lons.min(), self.user_lon)
+        max_lon = max(self._lons.max(), self.user_lon)
+        
+        # Add padding
+        lat_range = max_lat - min_lat
+        lon_range = max_lon - min_lon
+        if lat_range < 0.01:
+            lat_range = 0.01
+        if lon_range < 0.01:
+            lon_range = 0.01
+        
+        self._bounds = (
+            min_lat - lat_range * 0.1,
+            max_lat + lat_range * 0.1,
+            min_lon - lon_range * 0.1,
+            max_lon + lon_range * 0.1,
+        )
+    
     def paintEvent(self, event):
         """Draw the map with markers."""
         painter = QPainter(self)
@@ -139,31 +176,20 @@ class MapWidget(QWidget):
             )
             return
         
-        # Calculate bounds
-        lats = [loc[2] for loc in self.locations] + [self.user_lat]
-        lons = [loc[3] for loc in self.locations] + [self.user_lon]
-        
-        min_lat, max_lat = min(lats), max(lats)
-        min_lon, max_lon = min(lons), max(lons)
-        
-        # Add padding
-        lat_range = max_lat - min_lat
-        lon_range = max_lon - min_lon
-        if lat_range < 0.01:
-            lat_range = 0.01
-        if lon_range < 0.01:
-            lon_range = 0.01
-        
-        min_lat -= lat_range * 0.1
-        max_lat += lat_range * 0.1
-        min_lon -= lon_range * 0.1
-        max_lon += lon_range * 0.1
+        # Linear transform from cached bounds: pixel = coord * scale + offset
+        min_lat, max_lat, min_lon, max_lon = self._bounds
+        scale_x = (widget_width - 40) / (max_lon - min_lon)
+        scale_y = (widget_height - 40) / (max_lat - min_lat)
+        offset_x = 20 - min_lon * scale_x
+        offset_y = 20 + max_lat * scale_y
         
         # Map function: convert lat/lon to screen coordinates
         def map_coords(lat, lon):
-            x = int(((lon - min_lon) / (max_lon - min_lon)) * (widget_width - 40) + 20)
-            y = int(((max_lat - lat) / (max_lat - min_lat)) * (widget_height - 40) + 20)
-            return (x, y)
+            return (int(lon * scale_x + offset_x), int(offset_y - lat * scale_y))
+        
+        # Project all markers in one vectorized pass
+        marker_xs = (self._lons * scale_x + offset_x).astype(np.int32)
+        marker_ys = (offset_y - self._lats * scale_y).astype(np.int32)
         
         # Draw grid lines (optional)
         painter.setPen(QPen(QColor(51, 65, 85), 1, Qt.DashLine))
@@ -190,7 +216,7 @@ class MapWidget(QWidget):
         ]
         
         for i, (name, address, lat, lon, distance) in enumerate(self.locations):
-            x, y = map_coords(lat, lon)
+            x, y = int(marker_xs[i]), int(marker_ys[i])
             
             # Choose color based on distance
             if distance < 3:
@@ -234,6 +260,72 @@ class MapWidget(QWidget):
             painter.drawText(30, y_pos + 5, text)
 
 
+class LocationListModel(QAbstractListModel):
+    """List model exposing raw (name, address, lat, lon, distance_km) tuples."""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._locations = []
+    
+    def set_locations(self, locations):
+        """Replace all rows."""
+        self.beginResetModel()
+        self._locations = list(locations)
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._locations)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.UserRole:
+            return self._locations[index.row()]
+        if role == Qt.DisplayRole:
+            return self._locations[index.row()][0]
+        return None
+
+
+class LocationItemDelegate(QStyledItemDelegate):
+    """Paints a location row (name, address, distance) directly from the model tuple."""
+    
+    PADDING = 8
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._font = QFont("Arial", 10)
+        self._fm = QFontMetrics(self._font)
+        self._color_text = QColor(248, 250, 252)
+        self._color_border = QColor(51, 65, 85)
+        self._color_selected = QColor(30, 41, 59)
+    
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), 3 * self._fm.height() + 2 * self.PADDING + 1)
+    
+    def paint(self, painter, option, index):
+        name, address, lat, lon, distance = index.data(Qt.UserRole)
+        rect = option.rect
+        
+        painter.save()
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(rect, self._color_selected)
+        
+        # Row separator
+        painter.setPen(self._color_border)
+        painter.drawLine(rect.left(), rect.bottom(), rect.right(), rect.bottom())
+        
+        # Three text lines
+        painter.setFont(self._font)
+        painter.setPen(self._color_text)
+        x = rect.x() + self.PADDING
+        y = rect.y() + self.PADDING + self._fm.ascent()
+        line_height = self._fm.height()
+        painter.drawText(x, y, f"{index.row() + 1}. {name}")
+        painter.drawText(x, y + line_height, f"   {address}")
+        painter.drawText(x, y + 2 * line_height, f"   Jarak: {distance:.1f} km")
+        painter.restore()
+
+
 class LocationListWidget(QWidget):
     """Widget for displaying list of locations with details."""
     
@@ -252,24 +344,21 @@ class LocationListWidget(QWidget):
         title.setStyleSheet("color: #f8fafc; font-size: 14px; font-weight: bold;")
         layout.addWidget(title)
         
-        # List widget
-        self.list_widget = QListWidget()
-        self.list_widget.setStyleSheet("""
-            QListWidget {
+        # List view (rows painted by delegate, only visible rows are drawn)
+        self.list_model = LocationListModel(self)
+        self.list_view = QListView()
+        self.list_view.setModel(self.list_model)
+        self.list_view.setItemDelegate(LocationItemDelegate(self.list_view))
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setStyleSheet("""
+            QListView {
                 background-color: #0f172a;
                 border: 1px solid #334155;
                 border-radius: 5px;
                 color: #f8fafc;
             }
-            QListWidget::item {
-                padding: 8px;
-                border-bottom: 1px solid #334155;
-            }
-            QListWidget::item:selected {
-                background-color: #1e293b;
-            }
         """)
-        layout.addWidget(self.list_widget)
+        layout.addWidget(self.list_view)
     
     def set_locations(self, locations):
         """
@@ -278,10 +367,5 @@ class LocationListWidget(QWidget):
         Args:
             locations: List of (name, address, lat, lon, distance_km) tuples
         """
-        self.list_widget.clear()
-        
-        for i, (name, address, lat, lon, distance) in enumerate(locations):
-            item_text = f"{i+1}. {name}\n   {address}\n   Jarak: {distance:.1f} km"
-            item = QListWidgetItem(item_text)
-            self.list_widget.addItem(item)
+        self.list_model.set_locations(locations)
 
@@ -1,11 +1,106 @@
 """
 Overlay drawing utilities for video widget.
 """
-from PyQt5.QtGui import QPainter, QColor, QFont, QPen
+from functools import lru_cache
+from PyQt5.QtGui import QPainter, QColor, QFont, QFontMetrics, QPen
 from PyQt5.QtCore import Qt
 from ml.config import RECOMMENDATION
 
 
+@lru_cache(maxsize=32)
+def _font(name, size, bold):
+    """Shared QFont per (family, point_size, bold); callers must not modify it."""
+    return QFont(name, size, QFont.Bold if bold else QFont.Normal)
+
+
+# Label colors
+_LABEL_BG = QColor(0, 0, 0, 180)
+_WHITE = QColor(255, 255, 255)
+_YELLOW = QColor(255, 255, 0)
+_CYAN = QColor(0, 255, 255)
+
+
+def _draw_labeled_text(painter, text, pos, size, font_key, fg, bg_color=_LABEL_BG):
+    """
+    Draw text on a filled background rectangle.
+    
+    Args:
+        painter: QPainter
+        text: Text to draw
+        pos: (x, y) text baseline origin
+        size: (width, height) from text_size()
+        font_key: (family, point_size, bold) tuple
+        fg: Text QColor
+        bg_color: Background QColor
+    """
+    text_x, text_y = pos
+    text_w, text_h = size
+    painter.setFont(_font(*font_key))
+    painter.fillRect(text_x - 4, text_y - text_h - 2, text_w + 8, text_h + 4, bg_color)
+    painter.setPen(fg)
+    painter.drawText(text_x, text_y, text)
+
+
+@lru_cache(maxsize=512)
+def wrap_text(font_key, text, max_width, max_lines=3):
+    """
+    Word-wrap text to a pixel width (memoized).
+    
+    Args:
+        font_key: (family, point_size, bold) tuple
+        text: Text to wrap
+        max_width: Maximum line width in pixels
+        max_lines: Maximum lines to return
+    
+    Returns:
+        (lines, line_height) tuple, lines as a tuple of strings
+    """
+    fm = QFontMetrics(_font(*font_key))
+    words = text.split()
+    
+    # Measure each word once; line width is the running sum of advances
+    widths = [fm.horizontalAdvance(word) for word in words]
+    space_w = fm.horizontalAdvance(" ")
+    
+    lines = []
+    current_words = []
+    line_w = 0
+    
+    for word, word_w in zip(words, widths):
+        new_w = line_w + space_w + word_w if current_words else word_w
+        if new_w <= max_width:
+            current_words.append(word)
+            line_w = new_w
+        else:
+            if current_words:
+                lines.append(" ".join(current_words))
+            current_words = [word]
+            line_w = word_w
+            if len(lines) >= max_lines - 1:
+                break
+    
+    if current_words:
+        lines.append(" ".join(current_words))
+    
+    return tuple(lines[:max_lines]), fm.height()
+
+
+@lru_cache(maxsize=512)
+def text_size(font_key, text):
+    """
+    Measure text bounding box (memoized).
+    
+    Args:
+        font_key: (family, point_size, bold) tuple
+        text: Text to measure
+    
+    Returns:
+        (width, height) tuple in pixels
+    """
+    rect = QFontMetrics(_font(*font_key)).boundingRect(text)
+    return rect.width(), rect.height()
+
+
 def draw_bbox(painter, bbox_widget, pen_width=2):
     """
     Draw bounding box in green.
@@ -43,27 +138,10 @@ def draw_label_confidence(painter, label, confidence, bbox_widget, font_size=14)
     if text_y < 20:  # If too close to top, put below bbox
         text_y = int(y2) + 20
     
-    # Draw background rectangle for text
     text = f"{label} {confidence:.2f}"
-    font = QFont("Arial", font_size, QFont.Bold)
-    painter.setFont(font)
-    fm = painter.fontMetrics()
-    text_rect = fm.boundingRect(text)
-    
-    bg_rect_x = text_x - 4
-    bg_rect_y = text_y - text_rect.height() - 2
-    bg_rect_w = text_rect.width() + 8
-    bg_rect_h = text_rect.height() + 4
-    
-    # Semi-transparent background
-    painter.fillRect(
-        bg_rect_x, bg_rect_y, bg_rect_w, bg_rect_h,
-        QColor(0, 0, 0, 180)
-    )
-    
-    # Draw text
-    painter.setPen(QColor(255, 255, 255))
-    painter.drawText(text_x, text_y, text)
+    font_key = ("Arial", font_size, True)
+    _draw_labeled_text(painter, text, (text_x, text_y), text_size(font_key, text),
+                       font_key, _WHITE)
 
 
 def draw_top_panel(painter, recommendation, widget_width, alpha=0.6, max_lines=3):
@@ -80,38 +158,16 @@ def draw_top_panel(painter, recommendation, widget_width, alpha=0.6, max_lines=3
     if not recommendation:
         return
     
-    # Split recommendation into lines
-    words = recommendation.split()
-    lines = []
-    current_line = ""
-    
-    font = QFont("Arial", 12)
-    painter.setFont(font)
-    fm = painter.fontMetrics()
+    # Split recommendation into lines (cached per text/width)
+    font_key = ("Arial", 12, False)
+    painter.setFont(_font(*font_key))
     max_width = widget_width - 40  # Margins
-    
-    for word in words:
-        test_line = current_line + (" " if current_line else "") + word
-        if fm.width(test_line) <= max_width:
-            current_line = test_line
-        else:
-            if current_line:
-                lines.append(current_line)
-            current_line = word
-            if len(lines) >= max_lines - 1:
-                break
-    
-    if current_line:
-        lines.append(current_line)
-    
-    # Limit to max_lines
-    lines = lines[:max_lines]
+    lines, line_height = wrap_text(font_key, recommendation, max_width, max_lines)
     
     if not lines:
         return
     
     # Calculate panel height
-    line_height = fm.height()
     padding = 12
     panel_height = len(lines) * line_height + padding * 2
     
@@ -120,7 +176,7 @@ def draw_top_panel(painter, recommendation, widget_width, alpha=0.6, max_lines=3
     painter.fillRect(0, 0, widget_width, panel_height, bg_color)
     
     # Draw text
-    painter.setPen(QColor(255, 255, 255))
+    painter.setPen(_WHITE)
     y_offset = padding + line_height
     for line in lines:
         painter.drawText(20, y_offset, line)
@@ -139,29 +195,12 @@ def draw_fps(painter, fps, widget_width, widget_height, font_size=14):
         font_size: Font size
     """
     text = f"FPS: {fps:.1f}"
-    font = QFont("Arial", font_size, QFont.Bold)
-    painter.setFont(font)
-    fm = painter.fontMetrics()
-    text_rect = fm.boundingRect(text)
-    
-    # Position top-right
-    text_x = widget_width - text_rect.width() - 20
-    text_y = 25
-    
-    # Draw background
-    bg_rect_x = text_x - 4
-    bg_rect_y = text_y - text_rect.height() - 2
-    bg_rect_w = text_rect.width() + 8
-    bg_rect_h = text_rect.height() + 4
-    
-    painter.fillRect(
-        bg_rect_x, bg_rect_y, bg_rect_w, bg_rect_h,
-        QColor(0, 0, 0, 180)
-    )
-    
-    # Draw text in yellow
-    painter.setPen(QColor(255, 255, 0))  # Yellow
-    painter.drawText(text_x, text_y, text)
+    font_key = ("Arial", font_size, True)
+    size = text_size(font_key, text)
+    
+    # Position top-right, yellow
+    _draw_labeled_text(painter, text, (widget_width - size[0] - 20, 25), size,
+                       font_key, _YELLOW)
 
 
 def draw_status(painter, bbox_exists, result_exists, tracker_active, widget_width, widget_height, font_size=12):
@@ -183,27 +222,9 @@ def draw_status(painter, bbox_exists, result_exists, tracker_active, widget_widt
     
     text = f"bbox {bbox_status} | result {result_status} | tracker {tracker_status}"
     
-    font = QFont("Arial", font_size)
-    painter.setFont(font)
-    fm = painter.fontMetrics()
-    text_rect = fm.boundingRect(text)
-    
-    # Position bottom-left
-    text_x = 10
-    text_y = widget_height - 10
+    font_key = ("Arial", font_size, False)
     
-    # Draw background
-    bg_rect_x = text_x - 4
-    bg_rect_y = text_y - text_rect.height() - 2
-    bg_rect_w = text_rect.width() + 8
-    bg_rect_h = text_rect.height() + 4
-    
-    painter.fillRect(
-        bg_rect_x, bg_rect_y, bg_rect_w, bg_rect_h,
-        QColor(0, 0, 0, 180)
-    )
-    
-    # Draw text in cyan
-    painter.setPen(QColor(0, 255, 255))  # Cyan
-    painter.drawText(text_x, text_y, text)
+    # Position bottom-left, cyan
+    _draw_labeled_text(painter, text, (10, widget_height - 10), text_size(font_key, text),
+                       font_key, _CYAN)
 
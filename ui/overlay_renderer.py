@@ -8,40 +8,183 @@ from trust.decision_engine import DecisionState
 from trust.frame_quality import FrameQuality
 
 
+def _cuda_available() -> bool:
+    """Check whether OpenCV was built with CUDA and a device is present."""
+    try:
+        return hasattr(cv2, "cuda") and cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except cv2.error:
+        return False
+
+
 class OverlayRenderer:
     """Renders UI overlays on camera frames."""
     
-    def __init__(self):
+    # (text, font, scale, thickness) -> (width, height), shared by all instances
+    _textsize_cache: dict = {}
+    
+    # (text, font, scale, color, thickness) -> (bgra, mask, origin_x, origin_y)
+    # for fixed strings, rasterized once and blitted on every draw
+    _text_tiles: dict = {}
+    
+    STABILITY_BAR_W = 200  # Progress bar width in pixels
+    STABILITY_TEXT_Y = 50  # Baseline of the stability text (bar sits below it)
+    
+    def __init__(self, backend: str = "cpu"):
+        """
+        Args:
+            backend: "cpu" draws directly on frames. "cuda" accumulates overlays on a
+                transparent layer and alpha-composites it on the GPU in one pass
+                (falls back to "cpu" when no CUDA device is available).
+        """
+        self.backend = "cuda" if backend == "cuda" and _cuda_available() else "cpu"
         self.show_alignment_box = True
         self.show_stability = True
         self.show_quality_warnings = True
+        
+        # Static alignment-box layer (depends only on frame size)
+        self._static_size = None  # (W, H) the layer was built for
+        self._static_pixels = None  # (ys, xs, bgra) of drawn pixels
+        
+        # Annotation layer, rebuilt only when its inputs change. On the CPU path it
+        # excludes the stability progress fill, which is drawn directly every frame
+        self._last_sig = None
+        self._cached_layer = None  # (ys, xs, bgra) of drawn pixels
+        
+        # Reused output buffer for in_place=False (resized on shape change)
+        self._overlay_buf = None
+        
+        # CUDA backend: host-side BGRA accumulator and its device mirror
+        self._accum = None
+        self._accum_gpu = cv2.cuda_GpuMat() if self.backend == "cuda" else None
+        
+        # L-shaped corner accent (end, corner, end) and per-corner direction
+        # for top-left, top-right, bottom-left, bottom-right
+        self._corner_template = np.array([[1, 0], [0, 0], [0, 1]], dtype=np.int32)
+        self._corner_signs = np.array([[1, 1], [-1, 1], [1, -1], [-1, -1]], dtype=np.int32)
     
-    def render(self, frame: np.ndarray, decision_state: DecisionState,
+    def render(self, frame, decision_state: DecisionState,
                stability: float, frame_quality: Optional[FrameQuality],
-               current_label: Optional[str] = None) -> np.ndarray:
+               current_label: Optional[str] = None,
+               in_place: bool = False) -> np.ndarray:
         """
         Render all overlays on frame.
         
         Args:
-            frame: Input frame (BGR)
+            frame: Input frame (BGR ndarray, or cv2.cuda_GpuMat with the cuda backend)
             decision_state: Current decision state
             stability: Stability value (0..1)
             frame_quality: FrameQuality object or None
             current_label: Current predicted label
+            in_place: Draw directly into `frame` (caller owns the buffer and
+                accepts that it is modified). By default `frame` is left untouched
+                and overlays go on a copy held in a reused buffer (valid until the
+                next render call).
             
         Returns:
-            Frame with overlays rendered
+            Frame with overlays rendered (a GpuMat if a GpuMat was passed in)
         """
-        overlay = frame.copy()
+        if self.backend == "cuda":
+            return self._render_cuda(frame, decision_state, stability,
+                                     frame_quality, current_label, in_place)
+        
+        if in_place:
+            overlay = frame
+        else:
+            if self._overlay_buf is None or self._overlay_buf.shape != frame.shape \
+                    or self._overlay_buf.dtype != frame.dtype:
+                self._overlay_buf = np.empty_like(frame)
+            np.copyto(self._overlay_buf, frame)
+            overlay = self._overlay_buf
         H, W = overlay.shape[:2]
         
+        sig = self._overlay_signature(W, H, decision_state, frame_quality, current_label)
+        if sig != self._last_sig:
+            layer = np.zeros((H, W, 4), dtype=np.uint8)
+            self._draw_overlays(layer, W, H, decision_state, stability,
+                                frame_quality, current_label, progress=False)
+            ys, xs = np.nonzero(layer[..., 3])
+            self._cached_layer = (ys, xs, layer[ys, xs])
+            self._last_sig = sig
+        
+        ys, xs, bgra = self._cached_layer
+        overlay[ys, xs] = bgra[:, :overlay.shape[2]]
+        
+        # Changes nearly every frame while scanning: one small filled rectangle
+        if self.show_stability:
+            self._draw_stability_progress(overlay, W, stability,
+                                          self._stability_text(decision_state, current_label)[1])
+        return overlay
+    
+    def _overlay_signature(self, W: int, H: int, decision_state: DecisionState,
+                           frame_quality: Optional[FrameQuality],
+                           current_label: Optional[str]) -> tuple:
+        """Everything but stability that affects the drawn overlays."""
+        return (
+            W, H,
+            self.show_alignment_box, self.show_stability, self.show_quality_warnings,
+            decision_state,
+            bool(frame_quality),
+            bool(frame_quality and frame_quality.is_too_dark),
+            bool(frame_quality and frame_quality.is_blurry),
+            current_label,
+        )
+    
+    def _render_cuda(self, frame, decision_state: DecisionState,
+                     stability: float, frame_quality: Optional[FrameQuality],
+                     current_label: Optional[str], in_place: bool):
+        """Draw overlays on a transparent layer and alpha-composite it on the GPU."""
+        on_gpu = isinstance(frame, cv2.cuda_GpuMat)
+        if on_gpu:
+            W, H = frame.size()
+        else:
+            H, W = frame.shape[:2]
+        
+        # Accumulate every overlay on one transparent BGRA layer (only when it changed)
+        sig = self._overlay_signature(W, H, decision_state, frame_quality, current_label)
+        sig += (int(self.STABILITY_BAR_W * stability),)
+        if sig != self._last_sig:
+            if self._accum is None or self._accum.shape[:2] != (H, W):
+                self._accum = np.zeros((H, W, 4), dtype=np.uint8)
+            else:
+                self._accum.fill(0)
+            self._draw_overlays(self._accum, W, H, decision_state, stability,
+                                frame_quality, current_label)
+            self._accum_gpu.upload(self._accum)
+            self._last_sig = sig
+        
+        # Single upload + composite
+        if on_gpu:
+            frame_gpu = frame
+        else:
+            frame_gpu = cv2.cuda_GpuMat()
+            frame_gpu.upload(frame)
+        frame_bgra = cv2.cuda.cvtColor(frame_gpu, cv2.COLOR_BGR2BGRA)
+        out_gpu = cv2.cuda.alphaComp(self._accum_gpu, frame_bgra, cv2.cuda.ALPHA_OVER)
+        out_gpu = cv2.cuda.cvtColor(out_gpu, cv2.COLOR_BGRA2BGR)
+        
+        if on_gpu:
+            return out_gpu
+        if in_place:
+            out_gpu.download(frame)
+            return frame
+        return out_gpu.download()
+    
+    def _draw_overlays(self, overlay: np.ndarray, W: int, H: int,
+                       decision_state: DecisionState, stability: float,
+                       frame_quality: Optional[FrameQuality],
+                       current_label: Optional[str], progress: bool = True) -> np.ndarray:
+        """
+        Draw all enabled overlays onto a BGR frame or BGRA layer
+        (without the stability progress fill if progress is False).
+        """
         # Render alignment box
         if self.show_alignment_box:
             overlay = self._render_alignment_box(overlay, W, H)
         
         # Render stability indicator
         if self.show_stability:
-            overlay = self._render_stability(overlay, W, H, decision_state, stability, current_label)
+            overlay = self._render_stability(overlay, W, H, decision_state, stability,
+                                             current_label, progress)
         
         # Render quality warnings
         if self.show_quality_warnings and frame_quality:
@@ -49,8 +192,69 @@ class OverlayRenderer:
         
         return overlay
     
+    def _get_text_size(self, text: str, font: int, scale: float, thickness: int):
+        """Memoized cv2.getTextSize returning (width, height)."""
+        key = (text, font, scale, thickness)
+        size = self._textsize_cache.get(key)
+        if size is None:
+            size, _ = cv2.getTextSize(text, font, scale, thickness)
+            self._textsize_cache[key] = size
+        return size
+    
+    def _get_text_tile(self, text: str, font: int, scale: float, color: tuple, thickness: int):
+        """Rasterize a fixed string once onto a transparent BGRA tile."""
+        key = (text, font, scale, color, thickness)
+        tile = self._text_tiles.get(key)
+        if tile is None:
+            (tw, th), baseline = cv2.getTextSize(text, font, scale, thickness)
+            pad = thickness + 1  # Stroke and anti-aliasing spill past the text box
+            canvas = np.zeros((th + baseline + 2 * pad, tw + 2 * pad, 4), dtype=np.uint8)
+            cv2.putText(canvas, text, (pad, pad + th), font, scale, color, thickness, cv2.LINE_AA)
+            tile = (canvas, canvas[..., 3] > 0, pad, pad + th)
+            self._text_tiles[key] = tile
+        return tile
+    
+    def _put_static_text(self, frame: np.ndarray, text: str, org: tuple,
+                         font: int, scale: float, color: tuple, thickness: int):
+        """Draw a fixed string like cv2.putText, by blitting its cached tile."""
+        canvas, mask, ox, oy = self._get_text_tile(text, font, scale, color, thickness)
+        x0 = org[0] - ox
+        y0 = org[1] - oy
+        h, w = mask.shape
+        H, W = frame.shape[:2]
+        
+        # Clip tile to frame
+        fx0, fy0 = max(x0, 0), max(y0, 0)
+        fx1, fy1 = min(x0 + w, W), min(y0 + h, H)
+        if fx0 >= fx1 or fy0 >= fy1:
+            return
+        tile_rows = slice(fy0 - y0, fy1 - y0)
+        tile_cols = slice(fx0 - x0, fx1 - x0)
+        
+        np.copyto(frame[fy0:fy1, fx0:fx1],
+                  canvas[tile_rows, tile_cols, :frame.shape[2]],
+                  where=mask[tile_rows, tile_cols, None])
+    
     def _render_alignment_box(self, frame: np.ndarray, W: int, H: int) -> np.ndarray:
-        """Render alignment box in center."""
+        """Render alignment box in center (blitted from cached static layer)."""
+        if self._static_size != (W, H):
+            self._build_alignment_layer(W, H)
+        
+        ys, xs, bgra = self._static_pixels
+        frame[ys, xs] = bgra[:, :frame.shape[2]]
+        return frame
+    
+    def _build_alignment_layer(self, W: int, H: int):
+        """Rasterize the alignment box once for a frame size and cache its pixels."""
+        layer = np.zeros((H, W, 4), dtype=np.uint8)
+        self._draw_alignment_box(layer, W, H)
+        
+        ys, xs = np.nonzero(layer[..., 3])
+        self._static_pixels = (ys, xs, layer[ys, xs])
+        self._static_size = (W, H)
+    
+    def _draw_alignment_box(self, frame: np.ndarray, W: int, H: int):
+        """Draw alignment box onto a BGRA canvas (alpha marks drawn pixels)."""
         # Box dimensions: 60-70% width, 45-55% height
         box_w = int(W * 0.65)
         box_h = int(H * 0.50)
@@ -60,31 +264,23 @@ class OverlayRenderer:
         y2 = y1 + box_h
         
         # Draw box with rounded corners effect
-        color = (100, 255, 100)  # Light green
+        color = (100, 255, 100, 255)  # Light green
         thickness = 2
         
         # Main rectangle
         cv2.rectangle(frame, (x1, y1), (x2, y2), color, thickness)
         
-        # Corner accents
+        # Corner accents: four L-shapes in a single polylines call
         corner_len = 30
-        # Top-left
-        cv2.line(frame, (x1, y1), (x1 + corner_len, y1), color, 3)
-        cv2.line(frame, (x1, y1), (x1, y1 + corner_len), color, 3)
-        # Top-right
-        cv2.line(frame, (x2, y1), (x2 - corner_len, y1), color, 3)
-        cv2.line(frame, (x2, y1), (x2, y1 + corner_len), color, 3)
-        # Bottom-left
-        cv2.line(frame, (x1, y2), (x1 + corner_len, y2), color, 3)
-        cv2.line(frame, (x1, y2), (x1, y2 - corner_len), color, 3)
-        # Bottom-right
-        cv2.line(frame, (x2, y2), (x2 - corner_len, y2), color, 3)
-        cv2.line(frame, (x2, y2), (x2, y2 - corner_len), color, 3)
+        anchors = np.array([[x1, y1], [x2, y1], [x1, y2], [x2, y2]], dtype=np.int32)
+        corners = (anchors[:, None, :] +
+                   self._corner_template[None, :, :] * self._corner_signs[:, None, :] * corner_len)
+        cv2.polylines(frame, list(corners), False, color, 3)
         
         # Text hint
         text = "Align item inside the box"
         font = cv2.FONT_HERSHEY_SIMPLEX
-        (tw, th), _ = cv2.getTextSize(text, font, 0.6, 1)
+        tw, th = self._get_text_size(text, font, 0.6, 1)
         text_x = (W - tw) // 2
         text_y = y1 - 15
         if text_y < th:
@@ -92,61 +288,65 @@ class OverlayRenderer:
         
         # Text background
         cv2.rectangle(frame, (text_x - 5, text_y - th - 5),
-                     (text_x + tw + 5, text_y + 5), (0, 0, 0), -1)
-        cv2.putText(frame, text, (text_x, text_y),
-                    font, 0.6, color, 1, cv2.LINE_AA)
-        
-        return frame
+                     (text_x + tw + 5, text_y + 5), (0, 0, 0, 255), -1)
+        self._put_static_text(frame, text, (text_x, text_y), font, 0.6, color, 1)
+    
+    def _stability_text(self, decision_state: DecisionState,
+                        current_label: Optional[str]) -> tuple:
+        """(text, color) of the stability indicator for a decision state."""
+        if decision_state == DecisionState.LOCKED:
+            return f"✓ Stable: {current_label or 'LOCKED'}", (0, 255, 0, 255)  # Green
+        if decision_state == DecisionState.UNSTABLE:
+            return "Hold steady...", (0, 165, 255, 255)  # Orange
+        if decision_state == DecisionState.UNKNOWN:
+            return "Uncertain — improve lighting / move closer", (0, 0, 255, 255)  # Red
+        return "Scanning...", (255, 255, 0, 255)  # SCANNING: Cyan
+    
+    def _stability_bar_rect(self, W: int) -> tuple:
+        """(x, y, w, h) of the stability progress bar, below the top-center text."""
+        bar_w = self.STABILITY_BAR_W
+        return (W - bar_w) // 2, self.STABILITY_TEXT_Y + 30, bar_w, 8
+    
+    def _draw_stability_progress(self, frame: np.ndarray, W: int, stability: float, color: tuple):
+        """Fill the stability bar up to the current stability."""
+        bar_x, bar_y, bar_w, bar_h = self._stability_bar_rect(W)
+        progress_w = int(bar_w * stability)
+        cv2.rectangle(frame, (bar_x, bar_y), (bar_x + progress_w, bar_y + bar_h),
+                     color[:frame.shape[2]], -1)
     
     def _render_stability(self, frame: np.ndarray, W: int, H: int,
                          decision_state: DecisionState, stability: float,
-                         current_label: Optional[str]) -> np.ndarray:
-        """Render stability indicator."""
+                         current_label: Optional[str], progress: bool = True) -> np.ndarray:
+        """Render stability indicator (the progress fill only if progress is True)."""
         font = cv2.FONT_HERSHEY_SIMPLEX
         
         # Position: top center
-        y_pos = 50
-        
-        if decision_state == DecisionState.LOCKED:
-            text = f"✓ Stable: {current_label or 'LOCKED'}"
-            color = (0, 255, 0)  # Green
-            icon_text = "🔒"
-        elif decision_state == DecisionState.UNSTABLE:
-            text = "Hold steady..."
-            color = (0, 165, 255)  # Orange
-            icon_text = "⚠"
-        elif decision_state == DecisionState.UNKNOWN:
-            text = "Uncertain — improve lighting / move closer"
-            color = (0, 0, 255)  # Red
-            icon_text = "❓"
-        else:  # SCANNING
-            text = "Scanning..."
-            color = (255, 255, 0)  # Cyan
-            icon_text = "🔍"
+        y_pos = self.STABILITY_TEXT_Y
+        text, color = self._stability_text(decision_state, current_label)
         
         # Draw stability progress bar
-        bar_w = 200
-        bar_h = 8
-        bar_x = (W - bar_w) // 2
-        bar_y = y_pos + 30
+        bar_x, bar_y, bar_w, bar_h = self._stability_bar_rect(W)
         
         # Background
         cv2.rectangle(frame, (bar_x, bar_y), (bar_x + bar_w, bar_y + bar_h),
-                     (50, 50, 50), -1)
+                     (50, 50, 50, 255), -1)
         # Progress
-        progress_w = int(bar_w * stability)
-        cv2.rectangle(frame, (bar_x, bar_y), (bar_x + progress_w, bar_y + bar_h),
-                     color, -1)
+        if progress:
+            self._draw_stability_progress(frame, W, stability, color)
         
         # Text
-        (tw, th), _ = cv2.getTextSize(text, font, 0.7, 2)
+        tw, th = self._get_text_size(text, font, 0.7, 2)
         text_x = (W - tw) // 2
         
         # Text background
         cv2.rectangle(frame, (text_x - 10, y_pos - th - 5),
-                     (text_x + tw + 10, y_pos + 5), (0, 0, 0), -1)
-        cv2.putText(frame, text, (text_x, y_pos),
-                    font, 0.7, color, 2, cv2.LINE_AA)
+                     (text_x + tw + 10, y_pos + 5), (0, 0, 0, 255), -1)
+        if decision_state == DecisionState.LOCKED:
+            # Contains the live label: not a fixed string
+            cv2.putText(frame, text, (text_x, y_pos),
+                        font, 0.7, color, 2, cv2.LINE_AA)
+        else:
+            self._put_static_text(frame, text, (text_x, y_pos), font, 0.7, color, 2)
         
         return frame
     
@@ -182,21 +382,20 @@ class OverlayRenderer:
             
             # Determine color
             if "Low light" in warning:
-                color = (0, 100, 255)  # Orange-red
+                color = (0, 100, 255, 255)  # Orange-red
             elif "blurry" in warning:
-                color = (0, 165, 255)  # Orange
+                color = (0, 165, 255, 255)  # Orange
             else:
-                color = (255, 255, 0)  # Yellow
+                color = (255, 255, 0, 255)  # Yellow
             
             # Text size
-            (tw, th), _ = cv2.getTextSize(warning, font, 0.6, 1)
+            tw, th = self._get_text_size(warning, font, 0.6, 1)
             text_x = (W - tw) // 2
             
             # Background
             cv2.rectangle(frame, (text_x - 10, y_pos - th - 5),
-                         (text_x + tw + 10, y_pos + 5), (0, 0, 0), -1)
-            cv2.putText(frame, warning, (text_x, y_pos),
-                       font, 0.6, color, 1, cv2.LINE_AA)
+                         (text_x + tw + 10, y_pos + 5), (0, 0, 0, 255), -1)
+            self._put_static_text(frame, warning, (text_x, y_pos), font, 0.6, color, 1)
         
         return frame
 
@@ -3,9 +3,12 @@ OverlayWidget: Transparent overlay for bbox, labels, and confidence bars.
 Separate from video rendering for clean, anti-flicker display.
 """
 from PyQt5.QtWidgets import QWidget
-from PyQt5.QtGui import QPainter, QColor, QFont, QPen, QBrush
-from PyQt5.QtCore import Qt, QRect
+from PyQt5.QtGui import (QPainter, QPainterPath, QColor, QFont, QFontMetrics, QPen, QBrush,
+                         QStaticText, QTransform, QImage)
+from PyQt5.QtCore import Qt, QRect, QRectF, QTimer
 from domain.models import Detection
+from ml.config import RECOMMENDATION
+from ui.overlay import wrap_text
 
 
 class OverlayWidget(QWidget):
@@ -18,35 +21,158 @@ class OverlayWidget(QWidget):
         super().__init__(parent)
         self.setAttribute(Qt.WA_TransparentForMouseEvents, True)
         self.setAttribute(Qt.WA_TranslucentBackground, False)
+        self.setAttribute(Qt.WA_PaintOnScreen, False)
+        self.setAutoFillBackground(False)
         
         # State
         self.bbox = None  # (x1, y1, x2, y2) in widget coordinates
         self.detection: Detection = None
         self.fps = 0.0
         self.tracker_active = False
+        self._dirty = False  # A deferred repaint is already queued
+        
+        # Display strings, formatted in the setters rather than per paint
+        self._fps_text = "FPS: 0.0"
+        self._label_text = ""
+        self._panel_label_text = ""
+        self._recommendation_text = ""
+        self._status_text = ""
         
         # Frame dimensions (for coordinate mapping)
         self.frame_width = 640
         self.frame_height = 480
+        
+        # Paint resources (built once, reused every paint)
+        self._font_panel_key = ("Arial", 12, False)
+        self._font_label = QFont("Arial", 14, QFont.Bold)
+        self._font_panel = QFont("Arial", 12)
+        self._font_fps = QFont("Arial", 12, QFont.Bold)
+        self._font_status = QFont("Arial", 10)
+        
+        # Font metrics: widths via horizontalAdvance, heights are per-font constants
+        self._fm_label = QFontMetrics(self._font_label)
+        self._fm_fps = QFontMetrics(self._font_fps)
+        self._fm_status = QFontMetrics(self._font_status)
+        self._h_label = self._fm_label.height()
+        self._h_fps = self._fm_fps.height()
+        self._h_status = self._fm_status.height()
+        
+        # drawStaticText positions by top-left; drawText by baseline
+        self._asc_label = self._fm_label.ascent()
+        self._asc_panel = QFontMetrics(self._font_panel).ascent()
+        self._asc_fps = self._fm_fps.ascent()
+        self._asc_status = self._fm_status.ascent()
+        
+        self._color_bg = QColor(0, 0, 0, 200)
+        self._color_panel_bg = QColor(0, 0, 0, 180)
+        self._color_accent = QColor(16, 185, 129)  # Green accent
+        self._color_white = QColor(255, 255, 255)
+        self._color_yellow = QColor(255, 255, 0)
+        self._color_cyan = QColor(0, 255, 255)
+        
+        self._pen_bbox = QPen(self._color_accent, 2)
+        self._pen_corner = QPen(self._color_accent, 4)
+        
+        # Raster backing image (premultiplied ARGB), reallocated on resize and
+        # re-rendered only when overlay state changed since the last paint
+        self._image: QImage = None
+        self._image_stale = True
+        
+        # Wrapped recommendation per (label, widget_width) -> (static lines, line_height)
+        self._panel_cache: dict[tuple[str, int], tuple[tuple, int]] = {}
+        
+        # Pre-laid-out text, re-prepared only when the string changes
+        self._static_label = self._new_static_text()
+        self._static_panel_label = self._new_static_text()
+        self._static_fps = self._new_static_text()
+        self._static_status = self._new_static_text()
+        self._prepare_static_text(self._static_fps, self._fps_text, self._font_fps)
+        self._update_status_text()
+    
+    @staticmethod
+    def _new_static_text() -> QStaticText:
+        """Create an empty plain-text QStaticText."""
+        static = QStaticText()
+        static.setTextFormat(Qt.PlainText)
+        return static
+    
+    @staticmethod
+    def _prepare_static_text(static: QStaticText, text: str, font: QFont):
+        """Set text and lay it out once for font."""
+        static.setText(text)
+        static.prepare(QTransform(), font)
     
     def set_bbox(self, bbox_widget_coords):
         """Set bounding box in widget coordinates."""
         self.bbox = bbox_widget_coords
-        self.update()
+        self._update_status_text()
+        self._mark_dirty()
     
     def set_detection(self, detection: Detection):
         """Set detection result."""
+        self._set_detection(detection)
+        self._update_status_text()
+        self._mark_dirty()
+    
+    def _set_detection(self, detection: Detection):
+        """Store detection, invalidating the panel cache on label change."""
+        old_label = self.detection.label if self.detection else None
+        new_label = detection.label if detection else None
+        if new_label != old_label:
+            self._panel_cache.clear()
         self.detection = detection
-        self.update()
+        if detection is not None:
+            conf_pct = detection.confidence * 100
+            self._label_text = f"{detection.label} {conf_pct:.1f}%"
+            self._panel_label_text = f"{detection.label} ({conf_pct:.1f}%)"
+        else:
+            self._label_text = ""
+            self._panel_label_text = ""
+        if detection is not None and not detection.is_unknown:
+            self._recommendation_text = RECOMMENDATION.get(detection.label, "")
+        else:
+            self._recommendation_text = ""
+        self._prepare_static_text(self._static_label, self._label_text, self._font_label)
+        self._prepare_static_text(self._static_panel_label, self._panel_label_text, self._font_label)
     
     def set_fps(self, fps: float):
-        """Set FPS value."""
+        """Set FPS value (no repaint if the displayed text is unchanged)."""
         self.fps = fps
-        self.update()
+        text = f"FPS: {fps:.1f}"
+        if text == self._fps_text:
+            return
+        self._fps_text = text
+        self._prepare_static_text(self._static_fps, text, self._font_fps)
+        self._mark_dirty()
     
     def set_tracker_active(self, active: bool):
         """Set tracker active state."""
         self.tracker_active = active
+        self._update_status_text()
+        self._mark_dirty()
+    
+    def _update_status_text(self):
+        """Rebuild the status line from bbox/detection/tracker state."""
+        bbox_status = "YES" if self.bbox is not None else "NO"
+        result_status = "YES" if self.detection is not None else "NO"
+        tracker_status = "ACTIVE" if self.tracker_active else "INACTIVE"
+        text = f"bbox {bbox_status} | result {result_status} | tracker {tracker_status}"
+        if text == self._status_text:
+            return
+        self._status_text = text
+        self._prepare_static_text(self._static_status, text, self._font_status)
+    
+    def _mark_dirty(self):
+        """Schedule at most one repaint per event-loop tick."""
+        self._image_stale = True
+        if self._dirty:
+            return
+        self._dirty = True
+        QTimer.singleShot(0, self._flush_update)
+    
+    def _flush_update(self):
+        """Run the deferred repaint."""
+        self._dirty = False
         self.update()
     
     def set_frame_dimensions(self, width: int, height: int):
@@ -54,46 +180,105 @@ class OverlayWidget(QWidget):
         self.frame_width = width
         self.frame_height = height
     
+    def resizeEvent(self, event):
+        """Handle widget resize."""
+        super().resizeEvent(event)
+        self._panel_cache.clear()
+        self._image = None
+    
     def paintEvent(self, event):
+        """
+        Blit the raster backing image, first re-rendering it if overlay state
+        changed; repaints triggered by the video underneath reuse it as is.
+        """
+        dpr = self.devicePixelRatioF()
+        if self._image is None or self._image.devicePixelRatioF() != dpr:
+            self._image = QImage(self.size() * dpr, QImage.Format_ARGB32_Premultiplied)
+            self._image.setDevicePixelRatio(dpr)
+            self._image_stale = True
+        
+        if self._image_stale:
+            self._image.fill(Qt.transparent)
+            painter = QPainter(self._image)
+            painter.setRenderHint(QPainter.Antialiasing)
+            self._paint_overlay(painter)
+            painter.end()
+            self._image_stale = False
+        
+        QPainter(self).drawImage(0, 0, self._image)
+    
+    def _paint_overlay(self, painter: QPainter):
         """Paint overlay elements."""
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        
         widget_width = self.width()
         widget_height = self.height()
         
+        # Lay out text labels: (bg_rect, font, color, text_x, text_top, static_text)
+        labels = []
+        if self.bbox is not None and self.detection:
+            labels.append(self._layout_label_confidence(self.bbox))
+        labels.append(self._layout_fps(widget_width))
+        labels.append(self._layout_status(widget_height))
+        
+        # Top panel with recommendation: (panel_height, texts) or None
+        panel = None
+        if self._recommendation_text:
+            panel = self._layout_top_panel(self.detection.label, widget_width)
+        
         # Draw bbox
         if self.bbox is not None:
             self._draw_bbox(painter, self.bbox)
-            
-            # Draw label + confidence near bbox
-            if self.detection:
-                self._draw_label_confidence(painter, self.detection, self.bbox)
-        
-        # Draw top panel with recommendation
-        if self.detection and not self.detection.is_unknown:
-            self._draw_top_panel(painter, self.detection, widget_width)
-        
-        # Draw FPS (top-right)
-        self._draw_fps(painter, self.fps, widget_width)
         
-        # Draw status (bottom-left)
-        self._draw_status(painter, widget_width, widget_height)
+        # Paint bottom to top in the original order: bbox label, top panel, then FPS
+        # and status. Label backgrounds within a layer share a single fill, so without
+        # a panel in between all of them go in one call
+        if panel is None:
+            self._draw_labels(painter, labels)
+        else:
+            self._draw_labels(painter, labels[:-2])
+            painter.fillRect(0, 0, widget_width, panel[0], self._color_panel_bg)
+            self._draw_texts(painter, panel[1])
+            self._draw_labels(painter, labels[-2:])
+    
+    def _draw_labels(self, painter: QPainter, labels: list):
+        """Fill the label backgrounds as one path, then draw their text."""
+        if not labels:
+            return
+        bg_path = QPainterPath()
+        bg_path.setFillRule(Qt.WindingFill)
+        for bg_rect, *_ in labels:
+            bg_path.addRect(QRectF(bg_rect))
+        painter.fillPath(bg_path, self._color_bg)
+        self._draw_texts(painter, [label[1:] for label in labels])
+    
+    def _draw_texts(self, painter: QPainter, texts: list):
+        """
+        Draw (font, color, text_x, text_top, static) texts grouped by font and pen so
+        each is set once. Groups are drawn in order of first appearance, texts in
+        insertion order within a group.
+        """
+        batches = {}
+        for text in texts:
+            batches.setdefault((id(text[0]), id(text[1])), []).append(text)
+        
+        for batch in batches.values():
+            font, color = batch[0][:2]
+            painter.setFont(font)
+            painter.setPen(color)
+            for _, _, text_x, text_top, static in batch:
+                painter.drawStaticText(text_x, text_top, static)
     
     def _draw_bbox(self, painter: QPainter, bbox: tuple):
         """Draw bounding box with corner accents."""
         x1, y1, x2, y2 = map(int, bbox)
         
         # Main rectangle
-        pen = QPen(QColor(16, 185, 129), 2)  # Green accent
-        painter.setPen(pen)
+        painter.setPen(self._pen_bbox)
         painter.setBrush(Qt.NoBrush)
         painter.drawRect(x1, y1, x2 - x1, y2 - y1)
         
         # Corner accents
         corner_len = 20
-        pen.setWidth(4)
-        painter.setPen(pen)
+        painter.setPen(self._pen_corner)
         
         # Top-left
         painter.drawLine(x1, y1, x1 + corner_len, y1)
@@ -111,8 +296,8 @@ class OverlayWidget(QWidget):
         painter.drawLine(x2 - corner_len, y2, x2, y2)
         painter.drawLine(x2, y2 - corner_len, x2, y2)
     
-    def _draw_label_confidence(self, painter: QPainter, detection: Detection, bbox: tuple):
-        """Draw label and confidence near bbox."""
+    def _layout_label_confidence(self, bbox: tuple):
+        """Lay out label and confidence near bbox."""
         x1, y1, x2, y2 = bbox
         
         # Position text above bbox
@@ -122,132 +307,78 @@ class OverlayWidget(QWidget):
         if text_y < 30:  # If too close to top, put below bbox
             text_y = int(y2) + 25
         
-        label = detection.label
-        conf = detection.confidence
-        
-        # Draw background rectangle
-        text = f"{label} {conf*100:.1f}%"
-        font = QFont("Arial", 14, QFont.Bold)
-        painter.setFont(font)
-        fm = painter.fontMetrics()
-        text_rect = fm.boundingRect(text)
+        static = self._static_label
+        text_w, text_h = round(static.size().width()), self._h_label
         
         bg_rect = QRect(
-            text_x - 6, text_y - text_rect.height() - 4,
-            text_rect.width() + 12, text_rect.height() + 8
+            text_x - 6, text_y - text_h - 4,
+            text_w + 12, text_h + 8
         )
-        
-        painter.fillRect(bg_rect, QColor(0, 0, 0, 200))
-        
-        # Draw text
-        painter.setPen(QColor(255, 255, 255))
-        painter.drawText(text_x, text_y, text)
+        return (bg_rect, self._font_label, self._color_white,
+                text_x, text_y - self._asc_label, static)
     
-    def _draw_top_panel(self, painter: QPainter, detection: Detection, widget_width: int):
-        """Draw top panel with recommendation."""
-        from ml.config import RECOMMENDATION
-        
-        recommendation = RECOMMENDATION.get(detection.label, "")
-        if not recommendation:
-            return
-        
-        # Split recommendation into lines
-        words = recommendation.split()
-        lines = []
-        current_line = ""
-        
-        font = QFont("Arial", 12)
-        painter.setFont(font)
-        fm = painter.fontMetrics()
-        max_width = widget_width - 40
-        
-        for word in words:
-            test_line = current_line + (" " if current_line else "") + word
-            if fm.width(test_line) <= max_width:
-                current_line = test_line
-            else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = word
-                if len(lines) >= 2:  # Max 3 lines
-                    break
-        
-        if current_line:
-            lines.append(current_line)
-        
-        lines = lines[:3]
+    def _layout_top_panel(self, label: str, widget_width: int):
+        """Lay out top panel with recommendation; returns (panel_height, texts) or None."""
+        # Split recommendation into lines (max 3, cached per label/width)
+        key = (label, widget_width)
+        hit = self._panel_cache.get(key)
+        if hit is None:
+            lines, line_height = wrap_text(self._font_panel_key, self._recommendation_text,
+                                           widget_width - 40, 3)
+            statics = []
+            for line in lines:
+                static = self._new_static_text()
+                self._prepare_static_text(static, line, self._font_panel)
+                statics.append(static)
+            hit = (tuple(statics), line_height)
+            self._panel_cache[key] = hit
+        lines, line_height = hit
         
         if not lines:
-            return
+            return None
         
         # Calculate panel height
-        line_height = fm.height()
         padding = 12
         panel_height = len(lines) * line_height + padding * 2 + 30  # Extra for label
         
-        # Draw semi-transparent background
-        painter.fillRect(0, 0, widget_width, panel_height, QColor(0, 0, 0, 180))
-        
-        # Draw label
-        label_font = QFont("Arial", 14, QFont.Bold)
-        painter.setFont(label_font)
-        painter.setPen(QColor(16, 185, 129))  # Green accent
-        painter.drawText(20, 25, f"{detection.label} ({detection.confidence*100:.1f}%)")
+        # Label
+        texts = [(self._font_label, self._color_accent, 20, 25 - self._asc_label,
+                  self._static_panel_label)]
         
-        # Draw recommendation lines
-        painter.setFont(font)
-        painter.setPen(QColor(255, 255, 255))
+        # Recommendation lines
         y_offset = padding + line_height + 30
-        for line in lines:
-            painter.drawText(20, y_offset, line)
+        for static in lines:
+            texts.append((self._font_panel, self._color_white, 20,
+                          y_offset - self._asc_panel, static))
             y_offset += line_height
+        return panel_height, texts
     
-    def _draw_fps(self, painter: QPainter, fps: float, widget_width: int):
-        """Draw FPS counter (top-right)."""
-        text = f"FPS: {fps:.1f}"
-        font = QFont("Arial", 12, QFont.Bold)
-        painter.setFont(font)
-        fm = painter.fontMetrics()
-        text_rect = fm.boundingRect(text)
+    def _layout_fps(self, widget_width: int):
+        """Lay out FPS counter (top-right, yellow)."""
+        static = self._static_fps
+        text_w, text_h = round(static.size().width()), self._h_fps
         
-        text_x = widget_width - text_rect.width() - 20
+        text_x = widget_width - text_w - 20
         text_y = 25
         
-        # Background
         bg_rect = QRect(
-            text_x - 6, text_y - text_rect.height() - 4,
-            text_rect.width() + 12, text_rect.height() + 8
+            text_x - 6, text_y - text_h - 4,
+            text_w + 12, text_h + 8
         )
-        painter.fillRect(bg_rect, QColor(0, 0, 0, 200))
-        
-        # Text in yellow
-        painter.setPen(QColor(255, 255, 0))
-        painter.drawText(text_x, text_y, text)
+        return (bg_rect, self._font_fps, self._color_yellow,
+                text_x, text_y - self._asc_fps, static)
     
-    def _draw_status(self, painter: QPainter, widget_width: int, widget_height: int):
-        """Draw status text (bottom-left)."""
-        bbox_status = "YES" if self.bbox is not None else "NO"
-        result_status = "YES" if self.detection is not None else "NO"
-        tracker_status = "ACTIVE" if self.tracker_active else "INACTIVE"
-        
-        text = f"bbox {bbox_status} | result {result_status} | tracker {tracker_status}"
-        
-        font = QFont("Arial", 10)
-        painter.setFont(font)
-        fm = painter.fontMetrics()
-        text_rect = fm.boundingRect(text)
+    def _layout_status(self, widget_height: int):
+        """Lay out status text (bottom-left, cyan)."""
+        static = self._static_status
+        text_w, text_h = round(static.size().width()), self._h_status
         
         text_x = 10
         text_y = widget_height - 10
         
-        # Background
         bg_rect = QRect(
-            text_x - 6, text_y - text_rect.height() - 4,
-            text_rect.width() + 12, text_rect.height() + 8
+            text_x - 6, text_y - text_h - 4,
+            text_w + 12, text_h + 8
         )
-        painter.fillRect(bg_rect, QColor(0, 0, 0, 200))
-        
-        # Text in cyan
-        painter.setPen(QColor(0, 255, 255))
-        painter.drawText(text_x, text_y, text)
-
+        return (bg_rect, self._font_status, self._color_cyan,
+                text_x, text_y - self._asc_status, static)
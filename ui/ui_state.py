@@ -39,7 +39,8 @@ class UIStateMachine:
         """Check if capture is allowed."""
         return decision_state == DecisionState.LOCKED
     
-    def capture(self, frame: np.ndarray, decision_result, frame_quality) -> CapturedResult:
+    def capture(self, frame: np.ndarray, decision_result, frame_quality,
+                copy: bool = True) -> CapturedResult:
         """
         Capture current state for review mode.
         
@@ -47,6 +48,8 @@ class UIStateMachine:
             frame: Current frame image
             decision_result: DecisionStateResult from trust layer
             frame_quality: FrameQuality object
+            copy: Store a private copy of `frame`. Pass False only if the producer
+                will not write to `frame` afterwards; a read-only view is stored instead.
             
         Returns:
             CapturedResult object
@@ -67,8 +70,14 @@ class UIStateMachine:
         frames_agree = int(vote_ratio * 20)  # Assuming window size of 20
         stability_text = f"{frames_agree}/20 frames agree"
         
+        if copy:
+            frame_image = frame.copy()
+        else:
+            frame_image = frame.view()
+            frame_image.flags.writeable = False
+        
         self.captured_result = CapturedResult(
-            frame_image=frame.copy(),
+            frame_image=frame_image,
             plastic_type=decision_result.locked_label or decision_result.current_label or "UNKNOWN",
             confidence=conf,
             confidence_band=band,
@@ -1,11 +1,10 @@
 """
 VideoWidget: Displays camera feed only (no overlays - overlays in separate widget).
 """
-import cv2
 import numpy as np
 from PyQt5.QtWidgets import QWidget, QVBoxLayout
 from PyQt5.QtGui import QImage, QPainter, QPixmap
-from PyQt5.QtCore import Qt, QRect
+from PyQt5.QtCore import Qt, QRect, QTimer
 from ui.overlay_widget import OverlayWidget
 from domain.models import Detection
 
@@ -16,41 +15,140 @@ class VideoWidget(QWidget):
     Overlays are rendered in separate OverlayWidget on top.
     """
     
+    UPDATE_INTERVAL_MS = 16  # Repaint throttle, ~60 Hz
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         
         # Latest data
-        self.latest_frame = None  # BGR numpy array
+        self.latest_frame = None  # BGR numpy array (the widget's own copy)
         self.latest_bbox = None  # (x1, y1, x2, y2) in frame coordinates or None
         self.latest_detection: Detection = None
         self.latest_fps = 0.0
         self.tracker_active = False
+        self._frame_seq = 0  # Bumped on every new frame
+        self._pending_update = False  # A throttled repaint is already queued
+        
+        # Scaled pixmap for (frame_seq, widget_w, widget_h); reused by overlay-only repaints
+        self._scaled_cache_key = None
+        self._scaled_cache_pixmap = None
+        
+        # Nearest-neighbour scaling for live video; see set_smooth_scaling()
+        self._scale_mode = Qt.FastTransformation
+        
+        # Channel order of incoming frames (BGR from OpenCV by default)
+        self._frame_format = QImage.Format_BGR888
+        
+        # Persistent display buffers and the QImages wrapping them (rebuilt on size/format
+        # change). Frames are copied into the back buffer, then swapped to the front
+        self._frame_buf = None
+        self._qimage = None
+        self._back_buf = None
+        self._back_qimage = None
         
         # Frame dimensions (for coordinate mapping)
         self.frame_width = 640
         self.frame_height = 480
+        self._map_cache = None  # (frame_w, frame_h, widget_w, widget_h, scale, offset_x, offset_y)
         
         # Setup overlay widget
         self.overlay_widget = OverlayWidget(self)
         self.overlay_widget.setAttribute(Qt.WA_TransparentForMouseEvents, True)
         self.overlay_widget.raise_()  # Ensure overlay is on top
     
-    def setFrame(self, frame_bgr, fps):
+    def setFrame(self, frame_bgr, fps, is_intact=None):
         """
         Update frame and FPS.
         
         Args:
-            frame_bgr: BGR numpy array or None
+            frame_bgr: BGR numpy array or None (copied; the caller may reuse it)
             fps: FPS value
+            is_intact: Optional callable checked after the copy; if it returns False
+                the source was rewritten meanwhile and the frame is dropped
         """
-        self.latest_frame = frame_bgr
         self.latest_fps = fps
+        self.overlay_widget.set_fps(fps)
         if frame_bgr is not None and frame_bgr.size > 0:
-            self.frame_height, self.frame_width = frame_bgr.shape[:2]
+            if not self._store_frame(frame_bgr, is_intact):
+                return  # Torn copy: keep showing the previous frame
+            frame_h, frame_w = frame_bgr.shape[:2]
+            if (frame_w, frame_h) != (self.frame_width, self.frame_height):
+                self._map_cache = None
+            self.frame_height, self.frame_width = frame_h, frame_w
             self.overlay_widget.set_frame_dimensions(self.frame_width, self.frame_height)
-        self.update()  # Trigger repaint
+            frame_bgr = self._frame_buf
+        self.latest_frame = frame_bgr
+        self._frame_seq += 1
+        self._schedule_update()  # Trigger (coalesced) repaint
+    
+    def setFps(self, fps):
+        """Update the FPS readout only (the frame is left as is)."""
+        self.latest_fps = fps
         self.overlay_widget.set_fps(fps)
     
+    def _store_frame(self, frame, is_intact=None):
+        """
+        Copy frame into the back display buffer and swap it to the front
+        (the producer may reuse its buffer).
+        
+        Returns:
+            False if is_intact() reported the copy torn; the front buffer is kept
+        """
+        back = self._back_buf
+        if back is None or back.shape != frame.shape:
+            back = self._back_buf = np.empty(frame.shape, dtype=np.uint8)
+            self._back_qimage = None
+        np.copyto(back, frame)
+        if is_intact is not None and not is_intact():
+            return False
+        
+        if self._back_qimage is None:
+            h, w = back.shape[:2]
+            self._back_qimage = QImage(back.data, w, h, back.strides[0], self._frame_format)
+        self._frame_buf, self._back_buf = back, self._frame_buf
+        self._qimage, self._back_qimage = self._back_qimage, self._qimage
+        return True
+    
+    def set_frame_format(self, rgb: bool):
+        """
+        Declare the channel order of frames passed to setFrame().
+        
+        Args:
+            rgb: True if the producer already converted frames to RGB
+                (e.g. for other RGB sinks), False for OpenCV BGR (default)
+        """
+        self._frame_format = QImage.Format_RGB888 if rgb else QImage.Format_BGR888
+        self._qimage = None
+        self._back_qimage = None
+        if self._frame_buf is not None:
+            self._store_frame(self._frame_buf)
+            self.latest_frame = self._frame_buf
+        self._scaled_cache_key = None
+        self._schedule_update()
+    
+    def set_smooth_scaling(self, smooth: bool):
+        """
+        Choose bilinear (smooth) or nearest-neighbour (fast, default) frame scaling.
+        
+        Args:
+            smooth: True for Qt.SmoothTransformation, e.g. while paused
+        """
+        self._scale_mode = Qt.SmoothTransformation if smooth else Qt.FastTransformation
+        self._scaled_cache_key = None
+        self._schedule_update()
+    
+    def _schedule_update(self):
+        """Coalesce repaint requests into at most one per display refresh (~16 ms)."""
+        if self._pending_update:
+            return
+        self._pending_update = True
+        QTimer.singleShot(self.UPDATE_INTERVAL_MS, self._flush_update)
+    
+    def _flush_update(self):
+        """Run the throttled repaint."""
+        self._pending_update = False
+        self.update()
+    
     def setBBox(self, bbox_xyxy_or_none, tracker_active):
         """
         Update bounding box.
@@ -61,7 +159,7 @@ class VideoWidget(QWidget):
         """
         self.latest_bbox = bbox_xyxy_or_none
         self.tracker_active = tracker_active
-        self.update()  # Trigger repaint
+        self._schedule_update()  # Trigger (coalesced) repaint
         
         # Update overlay
         if bbox_xyxy_or_none is not None:
@@ -93,12 +191,15 @@ class VideoWidget(QWidget):
         else:
             self.latest_detection = None
         
-        self.update()  # Trigger repaint
+        self._schedule_update()  # Trigger (coalesced) repaint
         self.overlay_widget.set_detection(self.latest_detection)
     
     def resizeEvent(self, event):
         """Handle widget resize."""
         super().resizeEvent(event)
+        self._scaled_cache_key = None
+        self._scaled_cache_pixmap = None
+        self._map_cache = None
         # Resize overlay to match
         self.overlay_widget.setGeometry(0, 0, self.width(), self.height())
         self.overlay_widget.raise_()  # Ensure overlay stays on top
@@ -126,16 +227,23 @@ class VideoWidget(QWidget):
         
         x1_f, y1_f, x2_f, y2_f = bbox_frame
         
-        # Calculate scaling to fit frame in widget (keep aspect ratio)
-        scale_x = widget_width / self.frame_width
-        scale_y = widget_height / self.frame_height
-        scale = min(scale_x, scale_y)
-        
-        # Calculate offset (centering)
-        scaled_frame_w = self.frame_width * scale
-        scaled_frame_h = self.frame_height * scale
-        offset_x = (widget_width - scaled_frame_w) / 2
-        offset_y = (widget_height - scaled_frame_h) / 2
+        cache = self._map_cache
+        if cache is not None and cache[:4] == (self.frame_width, self.frame_height,
+                                               widget_width, widget_height):
+            scale, offset_x, offset_y = cache[4:]
+        else:
+            # Calculate scaling to fit frame in widget (keep aspect ratio)
+            scale_x = widget_width / self.frame_width
+            scale_y = widget_height / self.frame_height
+            scale = min(scale_x, scale_y)
+            
+            # Calculate offset (centering)
+            scaled_frame_w = self.frame_width * scale
+            scaled_frame_h = self.frame_height * scale
+            offset_x = (widget_width - scaled_frame_w) / 2
+            offset_y = (widget_height - scaled_frame_h) / 2
+            self._map_cache = (self.frame_width, self.frame_height,
+                               widget_width, widget_height, scale, offset_x, offset_y)
         
         # Map coordinates
         x1_w = offset_x + x1_f * scale
@@ -156,7 +264,7 @@ class VideoWidget(QWidget):
         # Draw background (black)
         painter.fillRect(0, 0, widget_width, widget_height, Qt.black)
         
-        if self.latest_frame is None:
+        if self.latest_frame is None or self._qimage is None:
             # No frame: draw placeholder
             painter.setPen(Qt.white)
             font = painter.font()
@@ -169,27 +277,30 @@ class VideoWidget(QWidget):
             )
             return
         
-        # Convert BGR to RGB
-        rgb_frame = cv2.cvtColor(self.latest_frame, cv2.COLOR_BGR2RGB)
-        h, w, ch = rgb_frame.shape
-        bytes_per_line = ch * w
-        
-        # Create QImage
-        qt_image = QImage(rgb_frame.data, w, h, bytes_per_line, QImage.Format_RGB888)
+        # Reuse the scaled pixmap if neither the frame nor the size changed
+        cache_key = (self._frame_seq, widget_width, widget_height)
+        if cache_key == self._scaled_cache_key:
+            self._draw_centered(painter, self._scaled_cache_pixmap, widget_width, widget_height)
+            return
         
-        # Scale to fit widget (keep aspect ratio)
-        scaled_image = qt_image.scaled(
+        # Scale the persistent QImage (no color conversion) to fit widget (keep aspect ratio)
+        scaled_image = self._qimage.scaled(
             widget_width, widget_height,
             Qt.KeepAspectRatio,
-            Qt.SmoothTransformation
+            self._scale_mode
         )
         
         # Convert QImage to QPixmap
         scaled_pixmap = QPixmap.fromImage(scaled_image)
+        self._scaled_cache_key = cache_key
+        self._scaled_cache_pixmap = scaled_pixmap
         
-        # Center the image
-        pixmap_x = (widget_width - scaled_pixmap.width()) // 2
-        pixmap_y = (widget_height - scaled_pixmap.height()) // 2
+        self._draw_centered(painter, scaled_pixmap, widget_width, widget_height)
+    
+    def _draw_centered(self, painter: QPainter, pixmap: QPixmap, widget_width: int, widget_height: int):
+        """Draw pixmap centered in the widget."""
+        pixmap_x = (widget_width - pixmap.width()) // 2
+        pixmap_y = (widget_height - pixmap.height()) // 2
         
-        painter.drawPixmap(pixmap_x, pixmap_y, scaled_pixmap)
+        painter.drawPixmap(pixmap_x, pixmap_y, pixmap)
 
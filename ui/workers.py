@@ -6,20 +6,23 @@ import numpy as np
 import time
 from PyQt5.QtCore import QThread, QObject, pyqtSignal, pyqtSlot, Qt
 from ml.classifier import PlastiTraceClassifier
-from vision.bbox_detector import detect_bbox, clamp_bbox_xyxy
+from vision.bbox_detector import BBoxDetector, clamp_bbox_xyxy
 from vision.bbox_tracker import BBoxTracker
 from vision.smoothing import EMASmoother
-from realtime.stability import ProbSmoother, HysteresisLabel, apply_confidence_gating
+from realtime.stability import ProbSmoother, HysteresisLabel, apply_confidence_gating, stabilize
 from ml.config import CLASSES
 
 
 class CameraWorker(QThread):
     """Worker thread for camera capture and bbox detection/tracking."""
     
-    frameReady = pyqtSignal(object)  # frame_bgr (numpy array as object)
+    frameReady = pyqtSignal(int)  # frame sequence number; see frame_at() / copy_frame()
     fpsReady = pyqtSignal(float)  # fps value
     bboxReady = pyqtSignal(object, bool)  # (bbox_xyxy_or_none, tracker_active)
     
+    # Capture buffers cycled by read(); frame n lives in slot n % BUFFER_RING_SIZE
+    BUFFER_RING_SIZE = 3
+    
     def __init__(self, camera_index=0):
         super().__init__()
         self.camera_index = camera_index
@@ -33,6 +36,7 @@ class CameraWorker(QThread):
         except:
             pass  # Tracker optional
         
+        self.bbox_detector = BBoxDetector()
         self.bbox_smoother = EMASmoother(alpha=0.7)
         self.frame_count = 0
         self.redetect_interval = 30
@@ -42,9 +46,83 @@ class CameraWorker(QThread):
         # FPS calculation
         self.fps_start_time = None
         self.fps_frame_count = 0
+        
+        # Reusable capture buffers (allocated from the first frame); _seq is the
+        # last published sequence number
+        self._buf_ring = None
+        self._seq = -1
+    
+    @property
+    def latest_seq(self):
+        """Sequence number of the newest published frame (-1 before the first)."""
+        return self._seq
+    
+    def is_intact(self, seq):
+        """
+        True while frame seq's slot has not started being rewritten. Check again
+        after reading a slot to detect that it was lapped in the meantime.
+        """
+        return self._buf_ring is not None and 0 <= self._seq - seq < self.BUFFER_RING_SIZE - 1
+    
+    def frame_at(self, seq):
+        """
+        Look up the newest published frame without copying.
+        
+        Args:
+            seq: Sequence number from frameReady
+        
+        Returns:
+            BGR ring buffer, or None if seq is no longer the newest frame. The view
+            is only safe for synchronous use; confirm with is_intact(seq) afterwards.
+        """
+        if seq != self._seq or self._buf_ring is None:
+            return None
+        return self._buf_ring[seq % self.BUFFER_RING_SIZE]
+    
+    def copy_frame(self, seq, out=None):
+        """
+        Copy a published frame out of the ring (for receivers on other threads).
+        
+        Args:
+            seq: Sequence number from frameReady
+            out: Optional array to copy into (used if its shape matches)
+        
+        Returns:
+            The copy, or None if the slot was lapped before or during the copy
+        """
+        ring = self._buf_ring
+        if ring is None or not self.is_intact(seq):
+            return None
+        src = ring[seq % self.BUFFER_RING_SIZE]
+        if out is None or out.shape != src.shape:
+            out = np.empty_like(src)
+        np.copyto(out, src)
+        return out if self.is_intact(seq) else None
+    
+    def _read_frame(self):
+        """Read the next frame into the next ring slot; returns (ret, seq)."""
+        seq = self._seq + 1
+        slot = seq % self.BUFFER_RING_SIZE
+        if self._buf_ring is None:
+            ret, frame = self.cap.read()
+        else:
+            buf = self._buf_ring[slot]
+            ret, frame = self.cap.read(buf)
+            if ret and frame is not buf:
+                # Frame size changed: read() allocated; rebuild the ring around it
+                self._buf_ring = None
+        if not ret:
+            return ret, -1
+        
+        if self._buf_ring is None:
+            ring = [np.empty_like(frame) for _ in range(self.BUFFER_RING_SIZE)]
+            ring[slot] = frame
+            self._buf_ring = ring
+        self._seq = seq
+        return ret, seq
     
     def set_redetect_interval(self, interval):
-        """Set redetection interval (frames)."""
+        """Set interval (frames) at which successful detections re-seed the tracker."""
         self.redetect_interval = max(10, min(120, int(interval)))
     
     def set_tracker_enabled(self, enabled):
@@ -69,12 +147,14 @@ class CameraWorker(QThread):
             return
         
         self.fps_start_time = time.time()
+        self._buf_ring = None
         
         while self.running:
-            ret, frame = self.cap.read()
+            ret, seq = self._read_frame()
             if not ret:
                 break
             
+            frame = self._buf_ring[seq % self.BUFFER_RING_SIZE]
             H, W = frame.shape[:2]
             self.frame_count += 1
             self.fps_frame_count += 1
@@ -87,47 +167,40 @@ class CameraWorker(QThread):
                 self.fps_frame_count = 0
                 self.fps_start_time = now
             
-            # Bbox pipeline
-            should_redetect = (
-                (self.frame_count % self.redetect_interval == 0) or
-                (self.tracker is None) or
-                (not self.tracker_active)
-            )
+            # Bbox pipeline: detect every frame (cheap, downsampled); the
+            # tracker is only a fallback for frames where detection fails
+            detected = self.bbox_detector(frame)
+            clamped = clamp_bbox_xyxy(detected, W, H) if detected is not None else None
             
-            if not should_redetect and self.tracker is not None and self.tracker.is_active():
-                # Update tracker
+            if clamped is not None:
+                self.current_bbox = clamped
+                # Re-seed tracker periodically to keep the fallback warm and bound drift
+                reseed = (not self.tracker_active) or (self.frame_count % self.redetect_interval == 0)
+                if self.tracker is not None and reseed:
+                    try:
+                        self.tracker.init(frame, self.current_bbox)
+                        self.tracker_active = True
+                    except:
+                        self.tracker_active = False
+            elif self.tracker is not None and self.tracker_active and self.tracker.is_active():
+                # Detection failed: fall back to tracker
                 tracked = self.tracker.update(frame)
                 if tracked is not None:
                     self.current_bbox = tracked
-                    self.tracker_active = True
-                else:
-                    self.tracker_active = False
-                    should_redetect = True
-            
-            if should_redetect:
-                # Detect new bbox
-                detected = detect_bbox(frame)
-                if detected is not None:
-                    clamped = clamp_bbox_xyxy(detected, W, H)
-                    if clamped is not None:
-                        self.current_bbox = clamped
-                        # Initialize tracker if available
-                        if self.tracker is not None:
-                            try:
-                                self.tracker.init(frame, self.current_bbox)
-                                self.tracker_active = True
-                            except:
-                                self.tracker_active = False
                 else:
                     self.current_bbox = None
                     self.tracker_active = False
+            else:
+                self.current_bbox = None
+                self.tracker_active = False
             
             # Smooth bbox
             if self.current_bbox is not None:
                 self.current_bbox = self.bbox_smoother.update_bbox(self.current_bbox)
             
-            # Emit signals
-            self.frameReady.emit(frame.copy())
+            # Publish the sequence number only: queued receivers may run late, so they
+            # look the slot up (and validate it) instead of holding a raw ring buffer
+            self.frameReady.emit(seq)
             self.bboxReady.emit(self.current_bbox, self.tracker_active)
     
     def stop(self):
@@ -143,17 +216,35 @@ class InferenceWorker(QObject):
     """Worker object for inference (moved to QThread)."""
     
     resultReady = pyqtSignal(dict)  # {label, confidence, probs, raw_label, raw_conf}
-    inferenceRequested = pyqtSignal(object, object)  # (frame_bgr, bbox_xyxy_or_none) - using object for numpy arrays
+    inferenceRequested = pyqtSignal(int, object)  # (frame_seq, bbox_xyxy_or_none)
     
-    def __init__(self, classifier: PlastiTraceClassifier):
+    def __init__(self, classifier: PlastiTraceClassifier, frame_source: CameraWorker):
+        """
+        Args:
+            classifier: Loaded classifier
+            frame_source: CameraWorker whose frame sequence numbers are requested
+        """
         super().__init__()
         self.classifier = classifier
+        self.frame_source = frame_source
         
         # Drop-frame strategy: only store latest request
-        self.latest_frame = None
+        self.latest_seq = None
         self.latest_bbox = None
         self.busy = False
         
+        # Frame selected for inference is copied here out of the capture ring
+        self._frame_buf = None
+        
+        # ROI expansion around bbox; clip bounds [W, H, W, H] follow the frame size
+        self._roi_scale = 1.2
+        self._roi_hi = None
+        self._roi_frame_size = None
+        
+        # Model-input buffer: ROIs are resized into it in place
+        size = classifier.input_size
+        self._input_buf = np.empty((size, size, 3), dtype=np.uint8)
+        
         # Stability components
         self.prob_smoother = ProbSmoother(alpha=0.6)
         self.hysteresis = HysteresisLabel(min_conf=0.55, switch_margin=0.10)
@@ -190,23 +281,18 @@ class InferenceWorker(QObject):
         """Set hysteresis switch margin."""
         self.hysteresis.switch_margin = float(margin)
     
-    @pyqtSlot(object, object)
-    def request(self, frame_bgr, bbox_xyxy_or_none):
+    @pyqtSlot(int, object)
+    def request(self, frame_seq, bbox_xyxy_or_none):
         """
         Request inference (drop-frame strategy).
         
         Args:
-            frame_bgr: BGR frame (numpy array) or None
+            frame_seq: Sequence number of a frame_source frame
             bbox_xyxy_or_none: Bounding box (x1, y1, x2, y2) or None
         """
-        # Drop-frame: overwrite latest request
-        if frame_bgr is not None:
-            try:
-                self.latest_frame = frame_bgr.copy()
-            except:
-                self.latest_frame = None
-        else:
-            self.latest_frame = None
+        # Drop-frame: overwrite latest request. Only the sequence number is kept;
+        # the frame is copied out of the ring if this request is processed
+        self.latest_seq = frame_seq
         self.latest_bbox = bbox_xyxy_or_none
         
         # Throttle by inference_interval
@@ -223,26 +309,38 @@ class InferenceWorker(QObject):
     
     def _process_inference(self):
         """Process inference request."""
-        if self.latest_frame is None:
+        if self.latest_seq is None:
             return
         
         self.busy = True
         
         try:
-            frame = self.latest_frame
+            # Requests arrive through queued signals, so the ring slot may be lapped
+            # by now; copy_frame() validates it after copying. A lapped request
+            # falls back to the newest frame so the throttled tick is not lost
+            source = self.frame_source
+            frame = source.copy_frame(self.latest_seq, self._frame_buf)
+            if frame is None:
+                frame = source.copy_frame(source.latest_seq, self._frame_buf)
+            if frame is None:
+                return
+            self._frame_buf = frame
             bbox = self.latest_bbox
             
             # Extract ROI
             H, W = frame.shape[:2]
             if bbox is not None:
-                x1, y1, x2, y2 = map(int, bbox)
-                # Expand ROI slightly (1.2x)
-                cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
-                w, h = (x2 - x1) * 1.2, (y2 - y1) * 1.2
-                x1 = max(0, int(cx - w / 2))
-                y1 = max(0, int(cy - h / 2))
-                x2 = min(W, int(cx + w / 2))
-                y2 = min(H, int(cy + h / 2))
+                if self._roi_frame_size != (H, W):
+                    self._roi_hi = np.array([W, H, W, H], dtype=np.int32)
+                    self._roi_frame_size = (H, W)
+                
+                # Expand ROI slightly (1.2x) about its center, clipped to the frame
+                b = np.asarray(bbox, dtype=np.float64).astype(np.int32)
+                center = (b[:2] + b[2:]) * 0.5
+                half = (b[2:] - b[:2]) * (self._roi_scale * 0.5)
+                corners = np.concatenate((center - half, center + half)).astype(np.int32)
+                np.clip(corners, 0, self._roi_hi, out=corners)
+                x1, y1, x2, y2 = corners.tolist()
                 roi = frame[y1:y2, x1:x2]
             else:
                 roi = frame
@@ -252,41 +350,36 @@ class InferenceWorker(QObject):
                 return
             
             # Run inference
-            result = self.classifier.predict_from_bgr(roi)
+            cv2.resize(roi, self._input_buf.shape[1::-1], dst=self._input_buf,
+                       interpolation=cv2.INTER_AREA)
+            result = self.classifier.predict_from_bgr_preresized(self._input_buf)
             if not result:
                 self.busy = False
                 return
             
-            probs = np.array(result.get("probs", [0.25] * len(CLASSES)), dtype=np.float32)
+            probs = np.asarray(result.get("probs", [0.25] * len(CLASSES)), dtype=np.float32)
             raw_label = result.get("label", CLASSES[0])
             raw_conf = result.get("confidence", 0.0)
             
-            # Apply stability
+            # Apply stability (EMA, argmax, hysteresis, gating fused in one kernel)
             if self.stabilize_enabled:
-                # EMA smooth probabilities
-                probs = self.prob_smoother.update(probs)
-                
-                # Get label from smoothed probs
-                idx = int(np.argmax(probs))
-                label = CLASSES[idx]
-                conf = float(probs[idx])
-                
-                # Apply hysteresis
-                label, conf = self.hysteresis.update(label, conf)
+                probs, gated_label, final_raw_label, final_raw_conf = stabilize(
+                    probs, self.prob_smoother, self.hysteresis, self.confidence_threshold
+                )
+                conf = final_raw_conf
             else:
-                label = raw_label
                 conf = raw_conf
-            
-            # Apply confidence gating
-            gated_label, final_raw_label, final_raw_conf = apply_confidence_gating(
-                label, conf, self.confidence_threshold
-            )
+                gated_label, final_raw_label, final_raw_conf = apply_confidence_gating(
+                    raw_label, conf, self.confidence_threshold
+                )
+            # One small ndarray copy: the source is a reused buffer, receivers keep the result
+            probs_out = probs.copy()
             
             # Emit result
             self.resultReady.emit({
                 "label": gated_label,
                 "confidence": conf if gated_label != "Unknown" else 0.0,
-                "probs": probs.tolist(),
+                "probs": probs_out,
                 "raw_label": final_raw_label,
                 "raw_conf": final_raw_conf
             })
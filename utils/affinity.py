@@ -0,0 +1,23 @@
+"""CPU affinity helper for worker threads."""
+
+import os
+
+
+def pin_current_thread(cpus):
+    """
+    Restrict the calling thread to the given CPU cores.
+    
+    Args:
+        cpus: Iterable of core indices, or None to leave scheduling unchanged
+        
+    Returns:
+        True if affinity was applied, False if unsupported (e.g. macOS/Windows) or failed
+    """
+    if cpus is None or not hasattr(os, "sched_setaffinity"):
+        return False
+    try:
+        os.sched_setaffinity(0, set(cpus))  # 0 = calling thread on Linux
+        return True
+    except (OSError, ValueError) as e:
+        print(f"Warning: could not set CPU affinity {set(cpus)}: {e}")
+        return False
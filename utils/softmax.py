@@ -1,7 +1,33 @@
 """Softmax utility function."""
 
+import math
 import numpy as np
 
+# Optional: numba compiles a scalar loop for the small 1-D case
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _softmax_1d(x, out):
+        """Scalar-loop softmax of 1-D x into out."""
+        m = x[0]
+        for i in range(1, x.shape[0]):
+            if x[i] > m:
+                m = x[i]
+        total = 0.0
+        for i in range(x.shape[0]):
+            e = math.exp(x[i] - m)
+            out[i] = e
+            total += e
+        inv = 1.0 / total
+        for i in range(x.shape[0]):
+            out[i] *= inv
+
 
 def softmax(logits):
     """
@@ -11,9 +37,15 @@ def softmax(logits):
         logits: Array-like of logit values
         
     Returns:
-        numpy array of probabilities
+        numpy float32 array of probabilities
     """
-    logits = np.array(logits)
-    exp_logits = np.exp(logits - np.max(logits))  # Numerical stability
-    return exp_logits / exp_logits.sum()
-
+    logits = np.asarray(logits, dtype=np.float32)
+    if NUMBA_AVAILABLE and logits.ndim == 1 and logits.size > 0:
+        out = np.empty_like(logits)
+        _softmax_1d(logits, out)
+        return out
+    
+    exp_logits = logits - logits.max()  # Numerical stability (new array; input untouched)
+    np.exp(exp_logits, out=exp_logits)
+    exp_logits /= exp_logits.sum()
+    return exp_logits
@@ -11,23 +11,76 @@ def clamp_bbox_xyxy(bbox, W, H, pad=12):
 
 def _sharpness(bgr):
     g = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
-    return cv2.Laplacian(g, cv2.CV_64F).var()
+    # 3x3 Laplacian of uint8 fits in int16 (|v| <= 1020)
+    return cv2.Laplacian(g, cv2.CV_16S).var()
 
-def detect_bbox(frame, min_area=2000, min_area_ratio=0.08, center_weight=3.0, use_sharpness=True):
+def detect_bbox(frame, min_area=2000, min_area_ratio=0.08, center_weight=3.0, use_sharpness=True,
+                sharpness_top_k=3, scale=0.5):
     """
     Pick a 'near object in front' via heuristics:
       - large contour
       - near center
-      - optionally sharper
-    """
-    H, W = frame.shape[:2]
-    min_area = max(min_area, int(min_area_ratio * (H * W)))
+      - optionally sharper (scored only for the top-k area/center candidates)
 
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    Edges and contours are found on a copy resized by `scale`; the returned
+    bbox and the sharpness term use full-resolution frame coordinates.
+    """
+    small = frame
+    if scale != 1.0:
+        small = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
     blur = cv2.GaussianBlur(gray, (5, 5), 0)
     edges = cv2.Canny(blur, 50, 150)
     edges = cv2.dilate(edges, None, iterations=1)
 
+    return _select_bbox(frame, edges, min_area, min_area_ratio, center_weight,
+                        use_sharpness, sharpness_top_k)
+
+class BBoxDetector:
+    """
+    detect_bbox as a callable that reuses its grayscale/blur/edge buffers
+    across frames (reallocated only when the frame size changes).
+    One instance per thread.
+    """
+    def __init__(self):
+        self._small = None
+        self._gray = None
+        self._blur = None
+        self._edges = None
+
+    def __call__(self, frame, min_area=2000, min_area_ratio=0.08, center_weight=3.0,
+                 use_sharpness=True, sharpness_top_k=3, scale=0.5):
+        H, W = frame.shape[:2]
+        sh, sw = max(1, int(round(H * scale))), max(1, int(round(W * scale)))
+        if self._gray is None or self._gray.shape != (sh, sw):
+            self._small = np.empty((sh, sw) + frame.shape[2:], dtype=frame.dtype)
+            self._gray = np.empty((sh, sw), dtype=np.uint8)
+            self._blur = np.empty((sh, sw), dtype=np.uint8)
+            self._edges = np.empty((sh, sw), dtype=np.uint8)
+
+        small = frame
+        if (sh, sw) != (H, W):
+            cv2.resize(frame, (sw, sh), dst=self._small, interpolation=cv2.INTER_AREA)
+            small = self._small
+        cv2.cvtColor(small, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        cv2.GaussianBlur(self._gray, (5, 5), 0, dst=self._blur)
+        cv2.Canny(self._blur, 50, 150, edges=self._edges)
+        cv2.dilate(self._edges, None, dst=self._edges, iterations=1)
+
+        return _select_bbox(frame, self._edges, min_area, min_area_ratio, center_weight,
+                            use_sharpness, sharpness_top_k)
+
+def _select_bbox(frame, edges, min_area, min_area_ratio, center_weight, use_sharpness,
+                 sharpness_top_k):
+    """
+    Rank contours of an edge map and return the best (x1, y1, x2, y2) or None.
+    The edge map may be smaller than frame; results are in frame coordinates.
+    """
+    H, W = frame.shape[:2]
+    sx = W / edges.shape[1]
+    sy = H / edges.shape[0]
+    min_area = max(min_area, int(min_area_ratio * (H * W)))
+
     # DEBUG: show edges (optional - uncomment to debug)
     # cv2.imshow("edges", edges)
 
@@ -36,29 +89,41 @@ def detect_bbox(frame, min_area=2000, min_area_ratio=0.08, center_weight=3.0, us
         return None
 
     cx0, cy0 = W / 2.0, H / 2.0
-    best, best_score = None, -1e18
+    candidates = []  # (score, bbox)
 
     for c in contours:
-        area = cv2.contourArea(c)
+        area = cv2.contourArea(c) * sx * sy
         if area < min_area:
             continue
 
         x, y, w, h = cv2.boundingRect(c)
-        x1, y1, x2, y2 = x, y, x + w, y + h
+        x1, y1 = int(x * sx), int(y * sy)
+        x2, y2 = min(W, int(round((x + w) * sx))), min(H, int(round((y + h) * sy)))
 
-        cx = x + w / 2.0
-        cy = y + h / 2.0
+        cx = (x1 + x2) / 2.0
+        cy = (y1 + y2) / 2.0
         dist = np.hypot(cx - cx0, cy - cy0) / np.hypot(cx0, cy0)
 
         score = area - center_weight * dist * (H * W)
+        candidates.append((score, (x1, y1, x2, y2)))
+
+    if not candidates:
+        return None
 
-        if use_sharpness:
-            roi = frame[y1:y2, x1:x2]
-            if roi.size > 0:
-                score += 200.0 * _sharpness(roi)
+    candidates.sort(key=lambda cand: cand[0], reverse=True)
+    if not use_sharpness:
+        return candidates[0][1]
+
+    # Re-rank only the leading candidates by sharpness
+    best, best_score = None, -1e18
+    for score, bbox in candidates[:sharpness_top_k]:
+        x1, y1, x2, y2 = bbox
+        roi = frame[y1:y2, x1:x2]
+        if roi.size > 0:
+            score += 200.0 * _sharpness(roi)
 
         if score > best_score:
             best_score = score
-            best = (x1, y1, x2, y2)
+            best = bbox
 
     return best
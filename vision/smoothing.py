@@ -4,20 +4,35 @@ class EMASmoother:
         self._bbox = None
         self._conf = None
 
+    @property
+    def alpha(self):
+        return self._a
+
+    @alpha.setter
+    def alpha(self, value):
+        # Keep alpha and 1 - alpha together so updates are plain multiply-adds
+        self._a = float(value)
+        self._b = 1.0 - self._a
+
     def update_bbox(self, bbox_xyxy):
         x1, y1, x2, y2 = bbox_xyxy
-        v = (float(x1), float(y1), float(x2), float(y2))
+        x1, y1, x2, y2 = float(x1), float(y1), float(x2), float(y2)
         if self._bbox is None:
-            self._bbox = v
+            bx1, by1, bx2, by2 = x1, y1, x2, y2
         else:
-            self._bbox = tuple(self.alpha * nv + (1 - self.alpha) * ov for nv, ov in zip(v, self._bbox))
-        x1, y1, x2, y2 = map(int, self._bbox)
-        return (x1, y1, x2, y2)
+            a, b = self._a, self._b
+            ox1, oy1, ox2, oy2 = self._bbox
+            bx1 = a * x1 + b * ox1
+            by1 = a * y1 + b * oy1
+            bx2 = a * x2 + b * ox2
+            by2 = a * y2 + b * oy2
+        self._bbox = (bx1, by1, bx2, by2)
+        return (int(bx1), int(by1), int(bx2), int(by2))
 
     def update_confidence(self, conf):
         c = float(conf)
         if self._conf is None:
             self._conf = c
         else:
-            self._conf = self.alpha * c + (1 - self.alpha) * self._conf
+            self._conf = self._a * c + self._b * self._conf
         return float(self._conf)
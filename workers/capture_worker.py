@@ -1,10 +1,12 @@
 """
-CaptureWorker: Reads frames from camera and emits latest frame (queue size 1).
+CaptureWorker: Reads frames from camera into a buffer ring and publishes the latest index.
 """
 import cv2
 import numpy as np
 import time
+from collections import deque
 from PyQt5.QtCore import QThread, pyqtSignal
+from utils.affinity import pin_current_thread
 
 
 class CaptureWorker(QThread):
@@ -13,22 +15,95 @@ class CaptureWorker(QThread):
     Emits latest frame only (drops old frames).
     """
     
-    frameReady = pyqtSignal(object)  # frame_bgr (numpy array)
+    frameReady = pyqtSignal(int)  # frame sequence number; look the frame up with frame_at()
     fpsReady = pyqtSignal(float)  # fps value
     
-    def __init__(self, camera_index=0):
+    RING_SIZE = 3
+    FPS_WINDOW = 30  # Grab timestamps kept for the FPS estimate
+    FPS_EMIT_EVERY = 15  # Grabs between fpsReady emissions
+    
+    def __init__(self, camera_index=0, cpu_affinity=None, time_critical=False):
+        """
+        Args:
+            camera_index: OpenCV camera index
+            cpu_affinity: Optional set of CPU cores to pin the capture thread to (Linux only)
+            time_critical: Run the capture thread at QThread.TimeCriticalPriority
+                (can starve the GUI thread on some platforms, e.g. Windows)
+        """
         super().__init__()
         self.camera_index = camera_index
+        self.cpu_affinity = cpu_affinity
+        self.time_critical = time_critical
         self.running = False
         self.cap = None
         
-        # FPS calculation
-        self.fps_start_time = None
-        self.fps_frame_count = 0
+        # FPS calculation: monotonic grab timestamps (ns) over a sliding window
+        self._ts_ring = deque(maxlen=self.FPS_WINDOW)
         self.fps = 0.0
+        
+        # Buffer ring: frames are decoded straight into these (sized from the first frame).
+        # Frame n lives in slot n % RING_SIZE; _seq is the last published sequence number
+        self._ring = None
+        self._seq = -1
+        
+        # Decode (retrieve) only every Nth grabbed frame; grabs still drain the driver queue
+        self._decode_every = 1
+        self._grab_count = 0
+    
+    def set_decode_interval(self, interval):
+        """Set decode interval (grabbed frames per decoded/emitted frame)."""
+        self._decode_every = max(1, int(interval))
+    
+    def is_intact(self, seq):
+        """
+        True while frame seq's slot has not started being rewritten. Check again
+        after reading a slot to detect that it was lapped in the meantime.
+        """
+        return self._ring is not None and 0 <= self._seq - seq < self.RING_SIZE - 1
+    
+    def frame_at(self, seq):
+        """
+        Look up the newest published frame without copying.
+        
+        Args:
+            seq: Sequence number from frameReady
+        
+        Returns:
+            BGR ring buffer, or None if seq is no longer the newest frame. The view
+            is only safe for synchronous use; confirm with is_intact(seq) afterwards.
+        """
+        ring = self._ring
+        if ring is None or seq != self._seq:
+            return None
+        return ring[seq % self.RING_SIZE]
+    
+    def _retrieve_frame(self):
+        """Decode the grabbed frame into the next ring slot; returns (ret, seq)."""
+        seq = self._seq + 1
+        slot = seq % self.RING_SIZE
+        if self._ring is None:
+            ret, frame = self.cap.retrieve()
+        else:
+            buf = self._ring[slot]
+            ret, frame = self.cap.retrieve(buf)
+            if ret and frame is not buf:
+                # Frame size changed: retrieve() allocated; rebuild the ring around it
+                self._ring = None
+        if not ret:
+            return ret, -1
+        
+        if self._ring is None:
+            ring = [np.empty_like(frame) for _ in range(self.RING_SIZE)]
+            ring[slot] = frame
+            self._ring = ring
+        self._seq = seq
+        return ret, seq
     
     def run(self):
         """Main capture loop."""
+        pin_current_thread(self.cpu_affinity)
+        if self.time_critical:
+            self.setPriority(QThread.TimeCriticalPriority)
         self.running = True
         self.cap = cv2.VideoCapture(self.camera_index)
         
@@ -37,30 +112,42 @@ class CaptureWorker(QThread):
             return
         
         # Set camera properties for better performance
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Driver drops stale frames (not all backends honor it)
+        self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
         self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
         self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
         self.cap.set(cv2.CAP_PROP_FPS, 30)
         
-        self.fps_start_time = time.time()
+        self._ts_ring.clear()
+        self._ring = None
         
         while self.running:
-            ret, frame = self.cap.read()
-            if not ret:
+            if not self.cap.grab():
                 break
             
-            self.fps_frame_count += 1
+            # FPS counts grabbed (camera) frames, decoded or not
+            ts = self._ts_ring
+            ts.append(time.perf_counter_ns())
+            self._grab_count += 1
             
             # Calculate and emit FPS periodically
-            now = time.time()
-            if now - self.fps_start_time >= 1.0:
-                self.fps = self.fps_frame_count / (now - self.fps_start_time)
-                self.fpsReady.emit(self.fps)
-                self.fps_frame_count = 0
-                self.fps_start_time = now
+            if self._grab_count % self.FPS_EMIT_EVERY == 0 and len(ts) > 1:
+                span = ts[-1] - ts[0]
+                if span > 0:
+                    self.fps = (len(ts) - 1) * 1e9 / span
+                    self.fpsReady.emit(self.fps)
+            
+            # Skip the decode for frames nobody will see
+            if self._grab_count % self._decode_every != 0:
+                continue
+            
+            ret, seq = self._retrieve_frame()
+            if not ret:
+                break
             
-            # Emit latest frame (drops old frames automatically via signal queue)
-            # Use direct connection to ensure latest frame wins
-            self.frameReady.emit(frame.copy())
+            # Publish only the sequence number; receivers fetch the slot with frame_at().
+            # The slot is rewritten RING_SIZE frames later; receivers that keep it longer copy it
+            self.frameReady.emit(seq)
         
         if self.cap:
             self.cap.release()
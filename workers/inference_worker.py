@@ -1,14 +1,18 @@
 """
 InferenceWorker: Processes frames with latest-frame-wins queue strategy.
 """
+import cv2
+import math
 import numpy as np
-from PyQt5.QtCore import QObject, QThread, pyqtSignal, pyqtSlot, QMutex
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QObject, QThread, pyqtSignal, pyqtSlot
 from ml.classifier import PlastiTraceClassifier
-from vision.bbox_detector import detect_bbox, clamp_bbox_xyxy
+from vision.bbox_detector import BBoxDetector, clamp_bbox_xyxy
 from vision.bbox_tracker import BBoxTracker
 from vision.smoothing import EMASmoother
-from realtime.stability import ProbSmoother, HysteresisLabel, apply_confidence_gating
+from realtime.stability import ProbSmoother, HysteresisLabel, apply_confidence_gating, stabilize
 from ml.config import CLASSES
+from utils.affinity import pin_current_thread
 
 
 class InferenceWorker(QObject):
@@ -19,16 +23,58 @@ class InferenceWorker(QObject):
     
     resultReady = pyqtSignal(dict)  # {label, confidence, probs, raw_label, raw_conf, bbox}
     bboxReady = pyqtSignal(object, bool)  # (bbox_xyxy_or_none, tracker_active)
+    _classified = pyqtSignal(object, object)  # (classifier result or None, bbox); executor -> worker thread
     
-    def __init__(self, classifier: PlastiTraceClassifier):
+    def __init__(self, classifier: PlastiTraceClassifier, cpu_affinity=None):
+        """
+        Args:
+            classifier: Loaded classifier
+            cpu_affinity: Optional set of CPU cores to pin the model thread to (Linux only)
+        """
         super().__init__()
         self.classifier = classifier
         
-        # Latest-frame buffer (overwrite strategy)
-        self._latest_frame = None
+        # Latest-frame slot (overwrite strategy); a single list-item store is atomic
+        # under the GIL, so publishing and taking a frame needs no lock
+        self._latest_frame_slot = [None]
         self._latest_bbox = None
-        self._mutex = QMutex()
-        self._busy = False
+        self._frame_intact = None  # Optional callable: False once the frame's buffer is reused
+        
+        # Model forward pass runs off this thread; one request in flight at a time
+        self._executor = ThreadPoolExecutor(max_workers=1, initializer=pin_current_thread,
+                                            initargs=(cpu_affinity,))
+        self._pending = None  # Future of the in-flight classification
+        self._classified.connect(self._on_classified)
+        
+        # Scratch buffers reused every inference: resized model input and output probs
+        size = classifier.input_size
+        self._resize_buf = np.empty((size, size, 3), dtype=np.uint8)
+        self._probs_buf = np.empty(len(CLASSES), dtype=np.float32)
+        self._classes_list = list(CLASSES)
+        
+        # GPU backends: classify the frame before each inference tick alongside it
+        self._batch_enabled = getattr(classifier, "supports_batch", False)
+        if self._batch_enabled:
+            self._prev_resize_buf = np.empty_like(self._resize_buf)
+            self._batch_probs = np.empty((2, len(CLASSES)), dtype=np.float32)
+        self._prev_ready = False
+        
+        # ROI expansion around bbox; clip bounds [W, H, W, H] follow the frame size
+        self._roi_scale = 1.2
+        self._roi_hi = None
+        self._roi_frame_size = None
+        
+        # ROI resize through OpenCL (T-API); opt-in via use_opencl, since it is not
+        # measured to beat the CPU resize for small ROIs
+        self._use_opencl = False
+        self._opencl_prev_state = None  # Global cv2.ocl setting before opting in
+        
+        # Similarity gate: skip the model when the ROI looks like the last classified one
+        self.similarity_eps = 3.0  # L1 distance between mean-BGR signatures
+        self._sig_buf = np.empty((16, 16, 3), dtype=np.uint8)
+        self._last_sig = None
+        self._last_sig_bbox = None
+        self._last_result = None
         
         # Bbox pipeline
         self.tracker = None
@@ -37,6 +83,8 @@ class InferenceWorker(QObject):
         except:
             pass
         
+        self.bbox_detector = BBoxDetector()
+        self.detect_scale = 0.25  # Edge/contour search at 1/4 size (160x120 for 640x480)
         self.bbox_smoother = EMASmoother(alpha=0.7)
         self.frame_count = 0
         self.redetect_interval = 30
@@ -55,6 +103,23 @@ class InferenceWorker(QObject):
         # Timer for periodic processing
         self._process_timer = None
     
+    @property
+    def use_opencl(self):
+        return self._use_opencl
+    
+    @use_opencl.setter
+    def use_opencl(self, enabled):
+        # cv2.ocl.setUseOpenCL is process-wide: remember and restore the prior setting
+        enabled = bool(enabled) and cv2.ocl.haveOpenCL()
+        if enabled == self._use_opencl:
+            return
+        if enabled:
+            self._opencl_prev_state = cv2.ocl.useOpenCL()
+            cv2.ocl.setUseOpenCL(True)
+        else:
+            cv2.ocl.setUseOpenCL(self._opencl_prev_state)
+        self._use_opencl = enabled
+    
     def set_inference_interval(self, interval):
         """Set inference interval (frames)."""
         self.inference_interval = max(1, min(10, int(interval)))
@@ -62,10 +127,12 @@ class InferenceWorker(QObject):
     def set_confidence_threshold(self, threshold):
         """Set confidence threshold for gating."""
         self.confidence_threshold = float(threshold)
+        self._last_sig = None
     
     def set_stabilize_enabled(self, enabled):
         """Enable/disable stabilization."""
         self.stabilize_enabled = bool(enabled)
+        self._last_sig = None
         if not enabled:
             self.prob_smoother.reset()
             self.hysteresis.reset()
@@ -95,21 +162,20 @@ class InferenceWorker(QObject):
                 self.tracker_active = False
     
     @pyqtSlot(object)
-    def on_frame_received(self, frame_bgr):
+    def on_frame_received(self, frame_bgr, is_intact=None):
         """
         Receive latest frame (latest-frame-wins strategy).
         
+        The frame is held by reference, not copied: it may be a CaptureWorker
+        ring slot. is_intact is checked after each stage reads the frame, and
+        results from a frame whose buffer was reused meanwhile are dropped.
+        
         Args:
             frame_bgr: BGR frame (numpy array)
+            is_intact: Optional callable, e.g. lambda: capture.is_intact(seq)
         """
-        self._mutex.lock()
-        try:
-            if frame_bgr is not None:
-                self._latest_frame = frame_bgr.copy()
-            else:
-                self._latest_frame = None
-        finally:
-            self._mutex.unlock()
+        self._latest_frame_slot[0] = frame_bgr
+        self._frame_intact = is_intact
         
         # Process bbox detection/tracking
         self._process_bbox()
@@ -118,13 +184,22 @@ class InferenceWorker(QObject):
         self.frame_count += 1
         if self.frame_count % self.inference_interval == 0:
             self._process_inference()
+        elif (self._batch_enabled and self._pending is None and
+              (self.frame_count + 1) % self.inference_interval == 0):
+            # Stage this frame's ROI to ride along with the next tick's batch
+            self._prev_ready = (self._resize_roi(frame_bgr, self._latest_bbox, self._prev_resize_buf) and
+                                not self._frame_lapped())
+    
+    def _frame_lapped(self):
+        """True if the current frame's buffer was reused while it was being read."""
+        return self._frame_intact is not None and not self._frame_intact()
     
     def _process_bbox(self):
         """Process bbox detection and tracking."""
-        if self._latest_frame is None:
+        frame = self._latest_frame_slot[0]
+        if frame is None:
             return
         
-        frame = self._latest_frame
         H, W = frame.shape[:2]
         
         # Bbox pipeline
@@ -146,7 +221,7 @@ class InferenceWorker(QObject):
         
         if should_redetect:
             # Detect new bbox
-            detected = detect_bbox(frame)
+            detected = self.bbox_detector(frame, scale=self.detect_scale)
             if detected is not None:
                 clamped = clamp_bbox_xyxy(detected, W, H)
                 if clamped is not None:
@@ -166,93 +241,226 @@ class InferenceWorker(QObject):
         if self.current_bbox is not None:
             self.current_bbox = self.bbox_smoother.update_bbox(self.current_bbox)
         
+        if self._frame_lapped():
+            return  # Torn frame: keep the previous bbox
+        
         # Emit bbox
         self.bboxReady.emit(self.current_bbox, self.tracker_active)
         self._latest_bbox = self.current_bbox
     
+    def shutdown(self):
+        """Stop accepting inference work (an in-flight request is left to finish)."""
+        self._executor.shutdown(wait=False)
+    
     def _process_inference(self):
-        """Process inference on latest frame."""
-        if self._busy:
-            return  # Skip if busy
+        """Submit inference on latest frame (non-blocking)."""
+        if self._pending is not None:
+            return  # Previous request still in flight (or its result not yet handled)
         
-        self._mutex.lock()
-        try:
-            frame = self._latest_frame
-            bbox = self._latest_bbox
-        finally:
-            self._mutex.unlock()
+        # Take the frame so it is classified at most once
+        frame = self._latest_frame_slot[0]
+        self._latest_frame_slot[0] = None
+        bbox = self._latest_bbox
         
         if frame is None:
             return
         
-        self._busy = True
+        use_batch = self._prev_ready
+        self._prev_ready = False
         
         try:
-            H, W = frame.shape[:2]
-            
-            # Extract ROI
-            if bbox is not None:
-                x1, y1, x2, y2 = map(int, bbox)
-                # Expand ROI slightly (1.2x)
-                cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
-                w, h = (x2 - x1) * 1.2, (y2 - y1) * 1.2
-                x1 = max(0, int(cx - w / 2))
-                y1 = max(0, int(cy - h / 2))
-                x2 = min(W, int(cx + w / 2))
-                y2 = min(H, int(cy + h / 2))
-                roi = frame[y1:y2, x1:x2]
-            else:
-                # Fallback: use center region
-                x1, y1 = int(W * 0.2), int(H * 0.2)
-                x2, y2 = int(W * 0.8), int(H * 0.8)
-                roi = frame[y1:y2, x1:x2]
+            # Resize the ROI into the scratch buffer here, so the executor never reads the frame
+            if not self._resize_roi(frame, bbox, self._resize_buf) or self._frame_lapped():
+                return
             
-            if roi.size == 0:
+            if self._is_similar_to_last(bbox):
+                self.resultReady.emit(dict(self._last_result, bbox=bbox))
                 return
             
-            # Run inference
-            result = self.classifier.predict_from_bgr(roi)
-            if not result:
+            self._pending = self._executor.submit(
+                self._run_classifier_batch if use_batch else self._run_classifier
+            )
+            self._pending.add_done_callback(
+                lambda future, bbox=bbox: self._classified.emit(future.result(), bbox)
+            )
+        
+        except Exception as e:
+            self._pending = None
+            print(f"Inference error: {e}")
+    
+    def _resize_roi(self, frame, bbox, dst):
+        """
+        Crop the (expanded) bbox ROI, or the center region without a bbox, into dst.
+        
+        Returns:
+            False if the ROI is empty
+        """
+        H, W = frame.shape[:2]
+        
+        # Extract ROI
+        if bbox is not None:
+            if self._roi_frame_size != (H, W):
+                self._roi_hi = np.array([W, H, W, H], dtype=np.int32)
+                self._roi_frame_size = (H, W)
+            
+            # Expand ROI slightly (1.2x) about its center, clipped to the frame
+            b = np.asarray(bbox, dtype=np.float64).astype(np.int32)
+            center = (b[:2] + b[2:]) * 0.5
+            half = (b[2:] - b[:2]) * (self._roi_scale * 0.5)
+            corners = np.concatenate((center - half, center + half)).astype(np.int32)
+            np.clip(corners, 0, self._roi_hi, out=corners)
+            x1, y1, x2, y2 = corners.tolist()
+            roi = frame[y1:y2, x1:x2]
+        else:
+            # Fallback: use center region
+            x1, y1 = int(W * 0.2), int(H * 0.2)
+            x2, y2 = int(W * 0.8), int(H * 0.8)
+            roi = frame[y1:y2, x1:x2]
+        
+        if roi.size == 0:
+            return False
+        
+        if self.use_opencl:
+            # Upload the crop, resize on the device, download only the small result
+            small = cv2.resize(cv2.UMat(roi), dst.shape[1::-1], interpolation=cv2.INTER_AREA)
+            np.copyto(dst, small.get())
+        else:
+            cv2.resize(roi, dst.shape[1::-1], dst=dst, interpolation=cv2.INTER_AREA)
+        return True
+    
+    def _is_similar_to_last(self, bbox):
+        """
+        Compare the resized ROI against the last classified one.
+        
+        The signature is the mean color of a 16x16 downsample. A bbox that moved
+        or resized by more than 20% drops the stored signature, so a stale
+        classification is never reused for a different object.
+        
+        Args:
+            bbox: Bbox the ROI was cropped from (or None for the center region)
+        
+        Returns:
+            True if the cached result can be re-emitted instead of classifying
+        """
+        cv2.resize(self._resize_buf, (16, 16), dst=self._sig_buf, interpolation=cv2.INTER_AREA)
+        sig = self._sig_buf.mean(axis=(0, 1))
+        
+        last_bbox = self._last_sig_bbox
+        if (bbox is None) != (last_bbox is None):
+            self._last_sig = None
+        elif bbox is not None:
+            x1, y1, x2, y2 = last_bbox
+            size = max(x2 - x1, y2 - y1, 1)
+            if max(abs(a - b) for a, b in zip(bbox, last_bbox)) > 0.2 * size:
+                self._last_sig = None
+        
+        similar = (
+            self._last_sig is not None and
+            self._last_result is not None and
+            np.abs(sig - self._last_sig).sum() < self.similarity_eps
+        )
+        if not similar:
+            self._last_sig = sig
+            self._last_sig_bbox = bbox
+        return similar
+    
+    def _run_classifier(self):
+        """Executor thread: classify the resized ROI in the scratch buffer."""
+        try:
+            idx, conf = self.classifier.predict_into(self._resize_buf, self._probs_buf)
+            return idx, conf, None
+        except Exception as e:
+            print(f"Inference error: {e}")
+            return None
+    
+    def _run_classifier_batch(self):
+        """Executor thread: classify the staged previous ROI and the current one together."""
+        try:
+            self.classifier.predict_from_bgr_batch(
+                [self._prev_resize_buf, self._resize_buf], probs_out=self._batch_probs
+            )
+            np.copyto(self._probs_buf, self._batch_probs[-1])
+            idx = int(self._probs_buf.argmax())
+            return idx, float(self._probs_buf[idx]), self._batch_probs[0]
+        except Exception as e:
+            print(f"Inference error: {e}")
+            return None
+    
+    def _stabilize_pair(self, prev_probs, probs):
+        """
+        Feed a batched (previous, current) pair through the stability state.
+        
+        Both frames update the EMA, but with alpha split so the two updates decay
+        the old state exactly as one update at the configured alpha does:
+        (1 - a')^2 = 1 - alpha. Smoothing therefore responds at the same rate on
+        batched (CUDA) and single-frame (CPU) classifiers. Only the latest frame
+        goes through hysteresis and gating.
+        
+        Returns:
+            Same tuple as stabilize()
+        """
+        smoother = self.prob_smoother
+        alpha = smoother.alpha
+        smoother.alpha = 1.0 - math.sqrt(1.0 - alpha)
+        try:
+            smoother.update(prev_probs)
+            return stabilize(probs, smoother, self.hysteresis, self.confidence_threshold)
+        finally:
+            smoother.alpha = alpha
+    
+    @pyqtSlot(object, object)
+    def _on_classified(self, result, bbox):
+        """
+        Apply stability to a finished classification and emit it.
+        
+        Args:
+            result: (top_idx, top_conf, prev_probs) from the classifier, probs in
+                self._probs_buf; prev_probs are the batched previous ROI's probs or None
+            bbox: Bbox the ROI was cropped from
+        """
+        try:
+            if result is None:
+                self._last_sig = None
                 return
             
-            probs = np.array(result.get("probs", [0.25] * len(CLASSES)), dtype=np.float32)
-            raw_label = result.get("label", CLASSES[0])
-            raw_conf = result.get("confidence", 0.0)
+            idx, raw_conf, prev_probs = result
+            raw_label = self._classes_list[idx]
+            probs = self._probs_buf
             
-            # Apply stability
+            # Apply stability (EMA, argmax, hysteresis, gating fused in one kernel)
             if self.stabilize_enabled:
-                # EMA smooth probabilities
-                probs = self.prob_smoother.update(probs)
-                
-                # Get label from smoothed probs
-                idx = int(np.argmax(probs))
-                label = CLASSES[idx]
-                conf = float(probs[idx])
-                
-                # Apply hysteresis
-                label, conf = self.hysteresis.update(label, conf)
+                if prev_probs is not None:
+                    probs, gated_label, final_raw_label, final_raw_conf = self._stabilize_pair(
+                        prev_probs, probs
+                    )
+                else:
+                    probs, gated_label, final_raw_label, final_raw_conf = stabilize(
+                        probs, self.prob_smoother, self.hysteresis, self.confidence_threshold
+                    )
+                conf = final_raw_conf
             else:
-                label = raw_label
                 conf = raw_conf
+                gated_label, final_raw_label, final_raw_conf = apply_confidence_gating(
+                    raw_label, conf, self.confidence_threshold
+                )
+            # One small ndarray copy: the source is a reused buffer, receivers keep the result
+            probs_out = probs.copy()
             
-            # Apply confidence gating
-            gated_label, final_raw_label, final_raw_conf = apply_confidence_gating(
-                label, conf, self.confidence_threshold
-            )
-            
-            # Emit result
-            self.resultReady.emit({
+            # Emit result (cached for the similarity gate)
+            self._last_result = {
                 "label": gated_label,
                 "confidence": conf if gated_label != "Unknown" else 0.0,
-                "probs": probs.tolist(),
+                "probs": probs_out,
                 "raw_label": final_raw_label,
                 "raw_conf": final_raw_conf,
                 "bbox": bbox
-            })
+            }
+            self.resultReady.emit(self._last_result)
         
         except Exception as e:
             print(f"Inference error: {e}")
         
         finally:
-            self._busy = False
+            # Scratch buffers are free again only once the result has been consumed
+            self._pending = None
 